@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import Optional, Annotated
-from datetime import timedelta, datetime
+from datetime import timedelta
 import secrets
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query, status
@@ -8,8 +8,12 @@ from fastapi.responses import RedirectResponse
 from app.services.auth_service import auth_service 
 from app.core.config import settings
 from app.dependencies import get_current_user
-from app.core.security import create_access_token, decode_access_token
-from app.auth.oauth import get_oauth_provider
+from app.core.security import (
+    create_access_token,
+    decode_access_token,
+    get_token_expiration_timestamp,
+)
+from app.auth.oauth import get_available_providers, get_oauth_provider
 from app.schemas.user import User
 
 import logging
@@ -270,14 +274,10 @@ async def refresh_token(request: Request, response: Response):
     return {
         "access_token": new_token,
         "token_type": "bearer",
-        "expires_at": int((datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)).timestamp()),
+        "expires_at": get_token_expiration_timestamp(),
     }
 
 
 @router.get("/providers")
 async def get_oauth_providers():
-    providers = []
-    for name, cfg in settings.OAUTH_PROVIDERS.items():
-        if cfg.get("client_id"):
-            providers.append({"name": name, "display_name": name.title()})
-    return {"providers": providers}
\ No newline at end of file
+    return {"providers": get_available_providers()}
\ No newline at end of file
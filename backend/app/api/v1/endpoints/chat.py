@@ -1,7 +1,10 @@
 from typing import Optional, Annotated
 import logging
 import time
+
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from app.services.chat_service import chat_service
 from app.schemas.chat import (
@@ -11,11 +14,7 @@ from app.schemas.chat import (
     ChatHistoryResponse,
     ChatSessionCreate,
     UpdateChatRequest,
-    SearchChatsRequest,
-    ChatSession,
-    ChatMessage,
     CreateSessionResponse,
-    SearchChatsResponse,
     MessageResponse,
     ClearIncognitoResponse,
     SwitchModeResponse,
@@ -26,6 +25,7 @@ from app.dependencies import get_current_user
 
 router = APIRouter(
     tags=["chat"],
+    default_response_class=ORJSONResponse,
     responses={
         status.HTTP_401_UNAUTHORIZED: {"description": "Not authenticated"},
         status.HTTP_404_NOT_FOUND: {"description": "Chat not found"},
@@ -53,7 +53,7 @@ async def send_message(
     - return response + sources
     """
     try:
-        start = time.time()
+        start = time.perf_counter()
         chat_id = request.chat_id
         if not chat_id:
             session = await chat_service.create_chat_session(
@@ -67,7 +67,7 @@ async def send_message(
 
         owns = await chat_service.verify_chat_owner(chat_id, current_user.id)
         if not owns:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Chat {chat_id} not found")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chat not found")
         result = await chat_service.get_response_with_sources(
             chat_id=chat_id,
             user_message=request.message,
@@ -75,13 +75,13 @@ async def send_message(
         )
 
         return ChatResponse(
-            response=result["response"],
-            chat_id=result["chat_id"],
-            message_id=result["message_id"],
-            user_message_id=None,  
-            is_incognito=(result["chat_id"] < 0),
-            sources=result["sources"],
-            processing_time=time.time() - start,
+            response=result.response,
+            chat_id=result.chat_id,
+            message_id=result.message_id,
+            user_message_id=result.user_message_id,
+            is_incognito=result.is_incognito,
+            sources=result.sources,
+            processing_time=time.perf_counter() - start,
             metadata={"temperature": request.temperature},
         )
 
@@ -162,13 +162,15 @@ async def get_chat_sessions(
         start = (page - 1) * page_size
         end = start + page_size
         total = len(chats)
-        return ChatListResponse(
+        # Returning a Response skips FastAPI's response_model re-validation;
+        # the payload is built from already-validated models.
+        return ORJSONResponse(ChatListResponse(
             chats=chats[start:end],
             total=total,
             page=page,
             page_size=page_size,
             has_more=end < total,
-        )
+        ).model_dump())
     except Exception as e:
         logger.exception("Error fetching chat sessions")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -182,21 +184,19 @@ async def get_chat_history(
     offset: int = Query(0, ge=0),
 ):
     try:
-        owns = await chat_service.verify_chat_owner(chat_id, current_user.id)
-        if not owns:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Chat {chat_id} not found")
-        
-        messages = await chat_service.get_chat_messages(chat_id, limit=limit, offset=offset)
-        chat_meta = await chat_service.get_chat_session(chat_id, current_user.id)
-        if not chat_meta:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Chat {chat_id} not found")
-
-        return ChatHistoryResponse(
+        history = await chat_service.get_chat_history(
+            chat_id, current_user.id, limit=limit, offset=offset
+        )
+        if not history:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chat not found")
+        chat_meta, messages = history
+
+        return ORJSONResponse(ChatHistoryResponse(
             chat=chat_meta,
             messages=messages,
             total_messages=chat_meta.message_count if chat_meta.message_count is not None else len(messages),
             has_more=(False if not limit else len(messages) == limit),
-        )
+        ).model_dump())
     except HTTPException:
         raise
     except Exception as e:
@@ -204,6 +204,29 @@ async def get_chat_history(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@router.get("/sessions/{chat_id}/stream")
+async def stream_chat_history(
+    chat_id: int,
+    current_user: CurrentUser,
+):
+    """Stream the full chat history as NDJSON, one message per line."""
+    owns = await chat_service.verify_chat_owner(chat_id, current_user.id)
+    if not owns:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chat not found")
+
+    def ndjson():
+        try:
+            for message in chat_service.iter_chat_messages(chat_id):
+                yield orjson.dumps(message.model_dump()) + b"\n"
+        except Exception:
+            # Headers (200) are already sent: end the body with an explicit
+            # error line so clients can tell it was cut short
+            logger.exception("Error streaming chat history")
+            yield orjson.dumps({"error": "Failed to stream chat history"}) + b"\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
 @router.patch("/sessions/{chat_id}", response_model=MessageResponse)
 async def update_chat_session(
     chat_id: int,
@@ -216,7 +239,7 @@ async def update_chat_session(
 
         owns = await chat_service.verify_chat_owner(chat_id, current_user.id)
         if not owns:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Chat {chat_id} not found")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chat not found")
 
         updated = await chat_service.update_chat(
             chat_id=chat_id,
@@ -242,7 +265,7 @@ async def delete_chat_session(
     try:
         owns = await chat_service.verify_chat_owner(chat_id, current_user.id)
         if not owns:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Chat {chat_id} not found")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chat not found")
 
         delete_chat = await chat_service.delete_chat(chat_id)
         if not delete_chat:
@@ -1,5 +1,6 @@
 import logging
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse
 
 from app.services.data_service import data_service
 
@@ -7,6 +8,7 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(
     tags=["data-sources"],
+    default_response_class=ORJSONResponse,
     responses={
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Service error"},
     },
@@ -15,7 +17,9 @@ router = APIRouter(
 @router.get("/data-sources")
 def get_data_sources():
     try:
-        return data_service.get_all_data_sources()
+        # Plain dict of JSON-native values: hand it straight to orjson
+        # instead of walking it with jsonable_encoder.
+        return ORJSONResponse(data_service.get_all_data_sources())
     except Exception as e:
         logger.error(f"Error getting data sources: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to get data sources")
@@ -1,7 +1,8 @@
 import logging
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Response, status
 from pydantic import BaseModel
 
 from app.services.speech_service import speech_service
@@ -75,11 +76,12 @@ async def transcribe_audio(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Transcription failed: {str(e)}")
 
 
-@router.get("/languages")
-async def get_supported_languages():
-    
+# Static payloads are encoded once at import time.
+_STATIC_CACHE_HEADERS = {"Cache-Control": "public, max-age=86400"}
+
+_LANGUAGES_BODY = orjson.dumps({
     # Whisper supports many languages, here are the most common ones
-    languages = [
+    "languages": [
         {"code": "en", "name": "English"},
         {"code": "es", "name": "Spanish"},
         {"code": "fr", "name": "French"},
@@ -100,9 +102,28 @@ async def get_supported_languages():
         {"code": "no", "name": "Norwegian"},
         {"code": "fi", "name": "Finnish"},
         {"code": "uk", "name": "Ukrainian"},
-    ]
-    
-    return {"languages": languages}
+    ],
+})
+
+_FORMATS_BODY = orjson.dumps({
+    "formats": [
+        {"format": "mp3", "mime_type": "audio/mpeg"},
+        {"format": "wav", "mime_type": "audio/wav"},
+        {"format": "webm", "mime_type": "audio/webm"},
+        {"format": "ogg", "mime_type": "audio/ogg"},
+        {"format": "m4a", "mime_type": "audio/m4a"},
+        {"format": "flac", "mime_type": "audio/flac"},
+    ],
+    "max_size_mb": 25,
+})
+
+
+@router.get("/languages")
+async def get_supported_languages():
+    """
+    Get list of supported transcription languages.
+    """
+    return Response(_LANGUAGES_BODY, media_type="application/json", headers=_STATIC_CACHE_HEADERS)
 
 
 @router.get("/formats")
@@ -113,13 +134,4 @@ async def get_supported_formats():
     Returns:
         List of supported audio formats
     """
-    formats = [
-        {"format": "mp3", "mime_type": "audio/mpeg"},
-        {"format": "wav", "mime_type": "audio/wav"},
-        {"format": "webm", "mime_type": "audio/webm"},
-        {"format": "ogg", "mime_type": "audio/ogg"},
-        {"format": "m4a", "mime_type": "audio/m4a"},
-        {"format": "flac", "mime_type": "audio/flac"},
-    ]
-    
-    return {"formats": formats, "max_size_mb": 25}
\ No newline at end of file
+    return Response(_FORMATS_BODY, media_type="application/json", headers=_STATIC_CACHE_HEADERS)
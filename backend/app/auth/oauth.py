@@ -1,27 +1,119 @@
 from __future__ import annotations
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, Tuple
+import asyncio
+from functools import lru_cache
+import hashlib
 import logging
 from urllib.parse import urlencode
+import weakref
 import httpx
+import orjson
+from cachetools import TTLCache
 from fastapi import HTTPException,status
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Tiomeout for HTTP requests to OAuth providers
-HTTP_TIMEOUT = 15.0
+# Timeouts for HTTP requests to OAuth providers, tight enough that a slow
+# provider can't dominate callback latency
+HTTP_TIMEOUT = httpx.Timeout(connect=2.0, read=4.0, write=2.0, pool=1.0)
+
+# One extra attempt on transient failures, after a short pause
+HTTP_RETRIES = 1
+HTTP_RETRY_BACKOFF = 0.2
+
+# GETs are idempotent, so any transport error may be retried; other requests
+# only when they never reached the provider (authorization codes are single-use)
+_RETRYABLE_GET_ERRORS = (httpx.TransportError,)
+_RETRYABLE_SEND_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Invariant request headers; per-call Authorization is added where needed
+_JSON_ACCEPT = {"Accept": "application/json"}
+_FORM_HEADERS = {**_JSON_ACCEPT, "Content-Type": "application/x-www-form-urlencoded"}
+
+GITHUB_EMAILS_URL = "https://api.github.com/user/emails"
+
+# Normalized provider profiles keyed by provider + hashed access token, so a
+# repeated lookup with the same token skips the provider round trips.
+USER_INFO_CACHE_TTL = 60
+_user_info_cache: TTLCache = TTLCache(maxsize=1024, ttl=USER_INFO_CACHE_TTL)
+# Single-flight locks per token key. Weak values: a lock lives exactly as long
+# as some coroutine holding or awaiting it keeps a reference.
+_user_info_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
 
 
 class OAuthProvider:
     """Base class for OAuth providers."""
 
+    # One pooled HTTP/2 client shared by all providers for the app's lifetime
+    _client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        if OAuthProvider._client is None or OAuthProvider._client.is_closed:
+            OAuthProvider._client = httpx.AsyncClient(
+                http2=True,
+                timeout=HTTP_TIMEOUT,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                headers=_JSON_ACCEPT,
+            )
+        return OAuthProvider._client
+
+    @classmethod
+    async def aclose_client(cls) -> None:
+        """Close the shared client (called on application shutdown)."""
+        if OAuthProvider._client is not None:
+            await OAuthProvider._client.aclose()
+            OAuthProvider._client = None
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request on the shared client, retrying transient failures
+        (see _RETRYABLE_*_ERRORS; GETs are also retried on 5xx responses).
+        """
+        client = self._get_client()
+        is_get = method == "GET"
+        retryable = _RETRYABLE_GET_ERRORS if is_get else _RETRYABLE_SEND_ERRORS
+        for attempt in range(HTTP_RETRIES + 1):
+            last_attempt = attempt == HTTP_RETRIES
+            try:
+                resp = await client.request(method, url, **kwargs)
+            except retryable as e:
+                if last_attempt:
+                    raise
+                logger.warning("[OAUTH] %s %s failed (%s), retrying", method, url, e)
+            else:
+                if not (is_get and resp.status_code >= 500) or last_attempt:
+                    return resp
+                logger.warning("[OAUTH] %s %s returned %s, retrying", method, url, resp.status_code)
+            await asyncio.sleep(HTTP_RETRY_BACKOFF * (attempt + 1))
+
     def __init__(self, provider_config: Dict[str, Any]):
         self.config = provider_config
+        self.authorize_url = provider_config.get("authorize_url")
+        self.token_url = provider_config.get("token_url")
+        self.userinfo_url = provider_config.get("userinfo_url")
+        self.scope = provider_config.get("scope")
         self.client_id = provider_config.get("client_id")
         self.client_secret = provider_config.get("client_secret")
         self.name = "generic"  # Should be overridden in subclasses
 
+        # Static part of the authorization URL, encoded once per provider
+        static_query = urlencode({
+            "client_id": self.client_id,
+            "scope": self.scope,
+            "response_type": "code",
+        })
+        self._authorize_prefix = f"{self.authorize_url}?{static_query}"
+
+        # Token-exchange form fields that don't depend on the callback
+        self._token_data_static = {
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "grant_type": "authorization_code",
+        }
+
     def get_authorization_url(
         self,
         redirect_uri: str,
@@ -32,18 +124,12 @@ class OAuthProvider:
         Generate the authorization URL.
         extra_params — for access_type=offline, prompt=consent, code_challenge, etc.
         """
-        params = {
-            "client_id": self.client_id,
-            "redirect_uri": redirect_uri,
-            "scope": self.config.get("scope"),
-            "response_type": "code",
-            "state": state,
-        }
+        params = {"redirect_uri": redirect_uri, "state": state}
         if extra_params:
             params.update(extra_params)
 
         # urlencode by default encodes space as '+', which is acceptable for OAuth
-        return f"{self.config['authorize_url']}?{urlencode(params)}"
+        return f"{self._authorize_prefix}&{urlencode(params)}"
 
     async def exchange_code_for_token(
         self,
@@ -52,74 +138,88 @@ class OAuthProvider:
         code_verifier: Optional[str] = None,
     ) -> str:
         """Exchange authorization code for access token."""
-        print(f"[OAUTH] Exchanging code for token")
-        logger.info(f"[OAUTH] Provider: {self.name}")
-        logger.debug(f"[OAUTH] Redirect URI: {redirect_uri}")
+        logger.debug("[OAUTH] Exchanging code for token (provider: %s)", self.name)
+        logger.debug("[OAUTH] Redirect URI: %s", redirect_uri)
         
-        data = {
-            "client_id": self.client_id,
-            "client_secret": self.client_secret,
-            "code": code,
-            "grant_type": "authorization_code",
-            "redirect_uri": redirect_uri,
-        }
+        data = {**self._token_data_static, "code": code, "redirect_uri": redirect_uri}
         
         if code_verifier:
             data["code_verifier"] = code_verifier
 
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/x-www-form-urlencoded",
-        }
-
-        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT) as client:
-            try:
-                resp = await client.post(
-                    self.config["token_url"], 
-                    data=data, 
-                    headers=headers
-                )
-                print(f"[OAUTH] Token exchange response status: {resp.status_code}")
-                
-                if resp.status_code != 200:
-                    print(f"[OAUTH ERROR] Token exchange failed")
-                    print(f"[OAUTH ERROR] Response: {resp.text}")
-                    raise HTTPException(
-                        status=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Failed to exchange code for token: {resp.text}"
-                    )
-                    
-            except httpx.RequestError as e:
-                print(f"[OAUTH ERROR] Request failed: {e}")
+        try:
+            resp = await self._send(
+                "POST",
+                self.token_url, 
+                data=data, 
+                headers=_FORM_HEADERS
+            )
+            logger.debug("[OAUTH] Token exchange response status: %s", resp.status_code)
+            
+            if resp.status_code != 200:
+                logger.error("[OAUTH] Token exchange failed: %s", resp.text)
                 raise HTTPException(
-                    status=status.HTTP_502_BAD_GATEWAY,
-                    detail=f"Failed to connect to {self.name}"
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Failed to exchange code for token: {resp.text}"
                 )
+                
+        except httpx.RequestError as e:
+            logger.error("[OAUTH] Request failed: %s", e)
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Failed to connect to {self.name}"
+            )
 
-        token_data = resp.json()
-        print(f"[OAUTH] Token data keys: {list(token_data.keys())}")
+        token_data = orjson.loads(resp.content)
+        logger.debug("[OAUTH] Token data keys: %s", token_data.keys())
         
         access_token = token_data.get("access_token")
         if not access_token:
-            print(f"[OAUTH ERROR] No access token in response")
+            logger.error("[OAUTH] No access token in response")
             raise HTTPException(
-                status=status.HTTP_400_BAD_REQUEST,
+                status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No access token received"
             )
         
-        print(f"[OAUTH] Successfully got access token")
+        logger.debug("[OAUTH] Successfully got access token")
         return access_token
 
     async def get_user_info(self, access_token: str) -> Dict[str, Any]:
+        """
+        Get normalized user information, cached for USER_INFO_CACHE_TTL seconds.
+        Concurrent lookups for the same token share a single provider request;
+        failures are not cached.
+        """
+        digest = hashlib.blake2b(access_token.encode(), digest_size=16).hexdigest()
+        key = f"{self.name}:{digest}"
+        user_info = _user_info_cache.get(key)
+        if user_info is not None:
+            return user_info
+
+        lock = _user_info_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            user_info = _user_info_cache.get(key)
+            if user_info is None:
+                user_info = await self._fetch_user_info(access_token)
+                _user_info_cache[key] = user_info
+            return user_info
+
+    async def _fetch_user_info(self, access_token: str) -> Dict[str, Any]:
         raise NotImplementedError
 
 
 class GoogleOAuth(OAuthProvider):
     """Google OAuth provider."""
 
+    GOOGLE_AUTH_PARAMS = (
+        ("access_type", "offline"),  # For obtaining refresh token
+        ("prompt", "select_account"),  # Always show account selection page
+        ("include_granted_scopes", "true"),
+    )
+
     def __init__(self, provider_config: Dict[str, Any]):
         super().__init__(provider_config)
         self.name = "google"
+        self._google_prefix = f"{self._authorize_prefix}&{urlencode(self.GOOGLE_AUTH_PARAMS)}"
 
     def get_authorization_url(
         self,
@@ -130,37 +230,32 @@ class GoogleOAuth(OAuthProvider):
         """
         Generate Google-specific authorization URL with extra parameters.
         """
-        google_params = {
-            "access_type": "offline",  # For obtaining refresh token
-            "prompt": "select_account",  # Always show account selection page
-            "include_granted_scopes": "true",  
-        }
-        
         if extra_params:
+            # Overrides of the Google defaults go through the generic path
+            google_params = dict(self.GOOGLE_AUTH_PARAMS)
             google_params.update(extra_params)
-            
-        # Call the parent method with Google parameters
-        return super().get_authorization_url(redirect_uri, state, google_params)
+            return super().get_authorization_url(redirect_uri, state, google_params)
 
-    async def get_user_info(self, access_token: str) -> Dict[str, Any]:
+        return f"{self._google_prefix}&{urlencode({'redirect_uri': redirect_uri, 'state': state})}"
+
+    async def _fetch_user_info(self, access_token: str) -> Dict[str, Any]:
         """
         Get user information from Google.
         Uses the v3 userinfo endpoint (OIDC compatible).
 
         """
         headers = {"Authorization": f"Bearer {access_token}"}
-        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT) as client:
-            try:
-                resp = await client.get(self.config["userinfo_url"], headers=headers)
-            except httpx.RequestError as e:
-                logger.error("Request to Google failed: %s", e)
-                raise HTTPException(status=status.HTTP_502_BAD_GATEWAY, detail="Failed to connect to Google")
+        try:
+            resp = await self._send("GET", self.userinfo_url, headers=headers)
+        except httpx.RequestError as e:
+            logger.error("Request to Google failed: %s", e)
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Failed to connect to Google")
 
         if resp.status_code != 200:
             logger.error("Failed to get user info from Google: %s %s", resp.status_code, resp.text)
-            raise HTTPException(status=status.HTTP_400_BAD_REQUEST, detail="Failed to get user info from Google")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to get user info from Google")
 
-        user_data = resp.json()
+        user_data = orjson.loads(resp.content)
         return {
             "provider_id": str(user_data.get("sub")),
             "email": user_data.get("email"),
@@ -176,75 +271,94 @@ class GitHubOAuth(OAuthProvider):
         super().__init__(provider_config)
         self.name = "github"
 
-    async def get_user_info(self, access_token: str) -> Dict[str, Any]:
+    async def _fetch_user_info(self, access_token: str) -> Dict[str, Any]:
         """
          Get user information from GitHub.
         """
-        headers = {"Authorization": f"Bearer {access_token}", "Accept": "application/json"}
+        # Accept: application/json comes from the shared client's defaults
+        headers = {"Authorization": f"Bearer {access_token}"}
+        # GitHub hides the email by default, so /user/emails is almost always
+        # needed — fetch both concurrently over the shared connection.
+        user_resp, emails_resp = await asyncio.gather(
+            self._send("GET", self.userinfo_url, headers=headers),
+            self._send("GET", GITHUB_EMAILS_URL, headers=headers),
+            return_exceptions=True,
+        )
+
+        if isinstance(user_resp, httpx.RequestError):
+            logger.error("Request to GitHub (userinfo) failed: %s", user_resp)
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Failed to connect to GitHub")
+        if isinstance(user_resp, BaseException):
+            raise user_resp
+
+        if user_resp.status_code != 200:
+            logger.error("Failed to get user info from GitHub: %s %s", user_resp.status_code, user_resp.text)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to get user info from GitHub")
+
+        user_data = orjson.loads(user_resp.content)
+        email = user_data.get("email")
+
+        if not email:
+            if isinstance(emails_resp, httpx.RequestError):
+                logger.error("Request to GitHub (emails) failed: %s", emails_resp)
+                raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Failed to connect to GitHub")
+            if isinstance(emails_resp, BaseException):
+                raise emails_resp
+
+            if emails_resp.status_code == 200:
+                emails = orjson.loads(emails_resp.content)
+                # Primary verified address; fallback — first available
+                email = next(
+                    (e.get("email") for e in emails if e.get("primary") and e.get("verified")),
+                    None,
+                ) or next((e.get("email") for e in emails), None)
+            else:
+                logger.warning(
+                    "GitHub /user/emails returned %s; falling back to a placeholder email",
+                    emails_resp.status_code,
+                )
 
-        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT) as client:
-            try:
-                user_resp = await client.get(self.config["userinfo_url"], headers=headers)
-            except httpx.RequestError as e:
-                logger.error("Request to GitHub (userinfo) failed: %s", e)
-                raise HTTPException(status=status.HTTP_502_BAD_GATEWAY, detail="Failed to connect to GitHub")
-
-            if user_resp.status_code != 200:
-                logger.error("Failed to get user info from GitHub: %s %s", user_resp.status_code, user_resp.text)
-                raise HTTPException(status=status.HTTP_400_BAD_REQUEST, detail="Failed to get user info from GitHub")
-
-            user_data = user_resp.json()
-            email = user_data.get("email")
-
-            if not email:
-                try:
-                    emails_resp = await client.get("https://api.github.com/user/emails", headers=headers)
-                except httpx.RequestError as e:
-                    logger.error("Request to GitHub (emails) failed: %s", e)
-                    raise HTTPException(status=status.HTTP_502_BAD_GATEWAY, detail="Failed to connect to GitHub")
-
-                if emails_resp.status_code == 200:
-                    emails = emails_resp.json()
-                    primary_verified = next(
-                        (e for e in emails if e.get("primary") and e.get("verified")),
-                        None,
-                    )
-                    if primary_verified:
-                        email = primary_verified.get("email")
-                    elif emails:
-                        # Fallback — first available
-                        email = emails[0].get("email")
-
-            return {
-                "provider_id": str(user_data.get("id")),
-                "email": email or f"{user_data.get('login')}@github.example.com",
-                "name": user_data.get("name") or user_data.get("login"),
-                "avatar_url": user_data.get("avatar_url"),
-                "provider": "github",
-                "provider_data": user_data,
-            }
-
-
-def get_available_providers() -> List[Dict[str, str]]:
-    providers: List[Dict[str, str]] = []
-    for name, cfg in settings.OAUTH_PROVIDERS.items():
-        if cfg.get("client_id") and cfg.get("client_secret"):
-            providers.append({"name": name, "display_name": name.capitalize()})
-    return providers
+        return {
+            "provider_id": str(user_data.get("id")),
+            "email": email or f"{user_data.get('login')}@github.example.com",
+            "name": user_data.get("name") or user_data.get("login"),
+            "avatar_url": user_data.get("avatar_url"),
+            "provider": "github",
+            "provider_data": user_data,
+        }
 
 
-def get_oauth_provider(provider_name: str) -> OAuthProvider:
-    """returns an instance of a specific provider."""
-    if provider_name not in settings.OAUTH_PROVIDERS:
-        raise HTTPException(status=status.HTTP_400_BAD_REQUEST, detail=f"Unsupported OAuth provider: {provider_name}")
+@lru_cache(maxsize=1)
+def get_available_providers() -> Tuple[Dict[str, str], ...]:
+    """Configured providers; the set is fixed once settings are loaded."""
+    return tuple(
+        {"name": name, "display_name": name.capitalize()}
+        for name, cfg in settings.OAUTH_PROVIDERS.items()
+        if cfg.get("client_id") and cfg.get("client_secret")
+    )
 
-    provider_config = settings.OAUTH_PROVIDERS[provider_name]
-    if not provider_config.get("client_id") or not provider_config.get("client_secret"):
-        raise HTTPException(status=status.HTTP_400_BAD_REQUEST, detail=f"Provider {provider_name} is not properly configured")
 
+@lru_cache(maxsize=8)
+def _build_provider(provider_name: str) -> Optional[OAuthProvider]:
+    """Construct a provider once per process; configs don't change at runtime."""
+    provider_config = settings.OAUTH_PROVIDERS[provider_name]
     if provider_name == "google":
         return GoogleOAuth(provider_config)
     if provider_name == "github":
         return GitHubOAuth(provider_config)
+    return None
+
+
+def get_oauth_provider(provider_name: str) -> OAuthProvider:
+    """returns an instance of a specific provider."""
+    if provider_name not in settings.OAUTH_PROVIDERS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unsupported OAuth provider: {provider_name}")
+
+    provider_config = settings.OAUTH_PROVIDERS[provider_name]
+    if not provider_config.get("client_id") or not provider_config.get("client_secret"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Provider {provider_name} is not properly configured")
 
-    raise HTTPException(status=status.HTTP_400_BAD_REQUEST, detail=f"Provider {provider_name} not implemented")
\ No newline at end of file
+    provider = _build_provider(provider_name)
+    if provider is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Provider {provider_name} not implemented")
+    return provider
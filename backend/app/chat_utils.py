@@ -1,4 +1,34 @@
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
+import threading
+
+from cachetools import LRUCache
+
+# Built contexts for recently seen FAQ result sets. Repeated questions return
+# the same top-K, so the assembled text can be reused as is.
+_context_cache: LRUCache = LRUCache(maxsize=512)
+_context_cache_lock = threading.Lock()
+
+# Section layout for FAQ-format results; the category line is only added when
+# the entry has a category
+_FAQ_TEMPLATE = "--- {Category} FAQ #{ID} ---\nQuestion: {Question}\nAnswer: {Answer}\n"
+_FAQ_TEMPLATE_WITH_CATEGORY = _FAQ_TEMPLATE + "Category: {Category}\n"
+
+
+def _context_cache_key(results: List[Dict[str, Any]]) -> Optional[Tuple[Any, ...]]:
+    """
+    Key made of everything the FAQ-format output depends on, or None when the
+    results are not all identifiable FAQ entries (those are never cached).
+    """
+    try:
+        key = tuple(
+            (r["ID"], r.get("_score", 0), r["Category"], r["Question"], r["Answer"])
+            for r in results
+        )
+        hash(key)
+    except (KeyError, TypeError):
+        return None
+    return key
+
 
 def build_context_from_results(results: List[Dict[str, Any]]) -> Tuple[str, str]:
     """
@@ -10,50 +40,66 @@ def build_context_from_results(results: List[Dict[str, Any]]) -> Tuple[str, str]
     Returns:
         Tuple[str, str]: (context for AI, note about data scarcity)
     """
+    key = _context_cache_key(results) if results else None
+    if key is not None:
+        with _context_cache_lock:
+            cached = _context_cache.get(key)
+        if cached is not None:
+            return cached
+
+    built = _assemble_context(results)
+
+    if key is not None:
+        with _context_cache_lock:
+            _context_cache[key] = built
+    return built
+
+
+def _assemble_context(results: List[Dict[str, Any]]) -> Tuple[str, str]:
     if not results:
         return "", "\n\nNote: No relevant information was found in our knowledge base. Please answer based on your general knowledge."
     
     # Sort results by relevance (if scores are present)
-    if "_score" in results[0]:
+    if len(results) > 1 and "_score" in results[0]:
         results = sorted(results, key=lambda x: x.get("_score", 0), reverse=True)
     
-    # Build context from results
+    # Build context from results; sections are built in one go (template or
+    # a single join) instead of growing a string field by field
     context_parts = []
+    skip_fields = {"_score", "_id", "_source", "_document_id", "_source_id"}
+    max_score = 0.0
     
     for i, result in enumerate(results):
-    # More informative label with category and ID
-        category = result.get("Category", "General")
-        faq_id = result.get("ID", i+1)
-        
-        # Form section header
-        section = f"--- {category} FAQ #{faq_id} ---\n"
-        
-        # Add document content
         if "Question" in result and "Answer" in result:
-            # For FAQ format
-            section += f"Question: {result['Question']}\n"
-            section += f"Answer: {result['Answer']}\n"
-            
-            # Add category if present
-            if "Category" in result and result["Category"]:
-                section += f"Category: {result['Category']}\n"
+            # For FAQ format: one interpolation of a shared template
+            if "Category" in result and "ID" in result:
+                fields = result
+            else:
+                fields = {"Category": "General", "ID": i + 1, **result}
+            template = _FAQ_TEMPLATE_WITH_CATEGORY if result.get("Category") else _FAQ_TEMPLATE
+            context_parts.append(template.format_map(fields))
         else:
-            # For arbitrary document
-            # Exclude service fields
-            skip_fields = ["_score", "_id", "_source", "_document_id", "_source_id"]
-            
-            # Add all other fields
-            for key, value in result.items():
-                if key not in skip_fields and value is not None:
-                    section += f"{key}: {value}\n"
-        
-        context_parts.append(section)
+            # For arbitrary document: labelled header, then all fields except
+            # service ones
+            category = result.get("Category", "General")
+            faq_id = result.get("ID", i+1)
+            parts = [f"--- {category} FAQ #{faq_id} ---\n"]
+            parts.extend(
+                f"{key}: {value}\n"
+                for key, value in result.items()
+                if key not in skip_fields and value is not None
+            )
+            context_parts.append("".join(parts))
+
+        score = result.get("_score", 0)
+        if score > max_score:
+            max_score = score
     
     # Combine all sections into a single context
     full_context = "\n".join(context_parts)
 
     # Determine if there is sufficient relevant information
-    has_relevant_info = any(result.get("_score", 0) > 0.7 for result in results)
+    has_relevant_info = max_score > 0.7
     
     scarcity_note = ""
     if not has_relevant_info:
@@ -1,8 +1,25 @@
 from re import U
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional, Dict, Any, List
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Tuple
 from functools import cached_property, lru_cache
 
+# Static OAuth endpoints and scopes; only credentials and redirect URIs vary
+_GOOGLE_ENDPOINTS = MappingProxyType({
+    "authorize_url": "https://accounts.google.com/o/oauth2/v2/auth",
+    "token_url": "https://oauth2.googleapis.com/token",
+    "userinfo_url": "https://www.googleapis.com/oauth2/v3/userinfo",
+    "scope": "openid email profile",
+})
+
+_GITHUB_ENDPOINTS = MappingProxyType({
+    "authorize_url": "https://github.com/login/oauth/authorize",
+    "token_url": "https://github.com/login/oauth/access_token",
+    "userinfo_url": "https://api.github.com/user",
+    "scope": "read:user user:email",
+})
+
+
 class Settings(BaseSettings):
     # Pydantic settings v2
     model_config = SettingsConfigDict(
@@ -43,14 +60,14 @@ class Settings(BaseSettings):
     DEBUG: bool = True
 
     # CORS
-    BACKEND_CORS_ORIGINS: List[str] = [
+    BACKEND_CORS_ORIGINS: Tuple[str, ...] = (
         "http://localhost:3000",
         "http://localhost:5173",
         "http://127.0.0.1:5173",
         "http://127.0.0.1:3000",
         "http://localhost:8000",
         "http://127.0.0.1:8000",
-    ]
+    )
 
     @cached_property
     def GOOGLE_REDIRECT_URI(self) -> str:
@@ -60,29 +77,23 @@ class Settings(BaseSettings):
     def GITHUB_REDIRECT_URI(self) -> str:
         return f"{self.BACKEND_URL}{self.API_V1_STR}/auth/github/callback"
 
-    @property
+    @cached_property
     def OAUTH_PROVIDERS(self) -> Dict[str, Dict[str, Any]]:
         providers: Dict[str, Dict[str, Any]] = {}
 
         if self.GOOGLE_CLIENT_ID and self.GOOGLE_CLIENT_SECRET:
             providers["google"] = {
+                **_GOOGLE_ENDPOINTS,
                 "client_id": self.GOOGLE_CLIENT_ID,
                 "client_secret": self.GOOGLE_CLIENT_SECRET,
-                "authorize_url": "https://accounts.google.com/o/oauth2/v2/auth",
-                "token_url": "https://oauth2.googleapis.com/token",
-                "userinfo_url": "https://www.googleapis.com/oauth2/v3/userinfo",
-                "scope": "openid email profile",
                 "redirect_uri": self.GOOGLE_REDIRECT_URI,
             }
 
         if self.GITHUB_CLIENT_ID and self.GITHUB_CLIENT_SECRET:
             providers["github"] = {
+                **_GITHUB_ENDPOINTS,
                 "client_id": self.GITHUB_CLIENT_ID,
                 "client_secret": self.GITHUB_CLIENT_SECRET,
-                "authorize_url": "https://github.com/login/oauth/authorize",
-                "token_url": "https://github.com/login/oauth/access_token",
-                "userinfo_url": "https://api.github.com/user",
-                "scope": "read:user user:email",
                 "redirect_uri": self.GITHUB_REDIRECT_URI,
             }
 
@@ -1,31 +1,82 @@
 """
 Security utilities: JWT tokens, password hashing, etc.
 """
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from datetime import timedelta
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, Tuple
+import hashlib
+import threading
 import time
 
+from cachetools import TLRUCache
 from fastapi import HTTPException, status
-from jose import jwt, JWTError
+import jwt
+from jwt.exceptions import PyJWTError
 from app.core.config import settings
 from app.schemas.user import TokenData
 
+# Verified token payloads, keyed by a BLAKE2b digest of the token so raw
+# credentials are never kept in memory. Entries live TOKEN_CACHE_TTL seconds at most and
+# never past the token's own expiry.
+TOKEN_CACHE_TTL = 30
+
+ACCESS_TOKEN_EXPIRE_SECONDS = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+# Signing key and accepted algorithms, prepared once instead of per call
+_SECRET_KEY_BYTES = settings.SECRET_KEY.encode("utf-8")
+_ALGORITHM = settings.ALGORITHM
+_ALGORITHMS = (_ALGORITHM,)
+# Tokens must carry exp and sub; PyJWT validates exp itself on decode
+_DECODE_OPTIONS = {"require": ["exp", "sub"]}
+
+
+def _payload_ttu(_key: bytes, payload: Dict[str, Any], now: float) -> float:
+    return now + min(TOKEN_CACHE_TTL, payload["exp"] - time.time())
+
+
+_decoded_cache: TLRUCache = TLRUCache(maxsize=10_000, ttu=_payload_ttu)
+_decoded_cache_lock = threading.Lock()
+
+# Payload verified earlier in the current request (set when the auth middleware
+# decodes the token), so dependencies re-checking the same token skip hashing.
+_request_payload: ContextVar[Optional[Tuple[str, Dict[str, Any]]]] = ContextVar(
+    "jwt_payload", default=None
+)
+
+
+def verify_and_cache(token: str) -> Dict[str, Any]:
+    """
+    jwt.decode with a short-lived cache of successful results.
+    Raises PyJWTError for invalid tokens; failures are never cached.
+    """
+    current = _request_payload.get()
+    if current is not None and current[0] == token and current[1]["exp"] > time.time():
+        payload = current[1]
+    else:
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        with _decoded_cache_lock:
+            payload = _decoded_cache.get(key)
+        if payload is None or payload["exp"] <= time.time():
+            payload = jwt.decode(
+                token, _SECRET_KEY_BYTES, algorithms=_ALGORITHMS, options=_DECODE_OPTIONS
+            )
+            with _decoded_cache_lock:
+                _decoded_cache[key] = payload
+        _request_payload.set((token, payload))
+    return payload
+
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Creates a JWT access token.
     """
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
+    # NumericDate claims straight from the epoch clock
+    now = int(time.time())
+    ttl = int(expires_delta.total_seconds()) if expires_delta else ACCESS_TOKEN_EXPIRE_SECONDS
+    to_encode.update({"exp": now + ttl, "iat": now})
     
-    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
-    
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jwt.encode(to_encode, _SECRET_KEY_BYTES, algorithm=_ALGORITHM)
 
 
 def decode_access_token(token: str) -> Optional[TokenData]:
@@ -34,14 +85,13 @@ def decode_access_token(token: str) -> Optional[TokenData]:
     Returns None in case of error (for application logic).
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        
-        if datetime.fromtimestamp(payload["exp"]) < datetime.utcnow():
-            return None
+        # Expiry is enforced by verify_and_cache (PyJWT on a miss, epoch
+        # comparison on a hit)
+        payload = verify_and_cache(token)
         
         token_data = TokenData(
             sub=payload["sub"],
-            exp=datetime.fromtimestamp(payload["exp"]),
+            exp=payload["exp"],
             name=payload["name"],
             email=payload["email"],
             is_active=payload.get("is_active", True)
@@ -61,15 +111,15 @@ def verify_token(token: str) -> Dict[str, Any]:
     )
     
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = verify_and_cache(token)
         user_id = payload.get("sub")
         if user_id is None:
             raise credentials_exception
         return {"user_id": user_id, "payload": payload}
-    except JWTError:
+    except PyJWTError:
         raise credentials_exception
 
 
 def get_token_expiration_timestamp() -> int:
-    expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    return int(time.mktime(expire.timetuple()))
+    # Plain epoch arithmetic: mktime() read the UTC timetuple as local time
+    return int(time.time()) + ACCESS_TOKEN_EXPIRE_SECONDS
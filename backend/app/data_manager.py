@@ -1,12 +1,65 @@
 from __future__ import annotations
-from asyncio.log import logger
-from app.vector_search import vector_search
+from app.vector_search import SearchBatcher, vector_search
 
+from bisect import bisect_right
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 
+import csv
+import logging
 import os
+import threading
+import time
+import numpy as np
 import pandas as pd
+from cachetools import TTLCache
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds between freshness checks of the FAQ vector index on the query path
+FAQ_INDEX_CHECK_INTERVAL = 30
+
+# FAQ columns used downstream; anything else in the CSV is not parsed
+FAQ_TEXT_COLUMNS = ("Category", "Question", "Answer")
+FAQ_COLUMNS = ("ID",) + FAQ_TEXT_COLUMNS
+
+# Repeated FAQ queries are answered from memory for this long
+FAQ_SEARCH_CACHE_TTL = 300
+
+# Separate rows / fields inside a search buffer; queries containing either are
+# rejected so a match never spans two rows or two fields
+_ROW_SEPARATOR = "\x00"
+_FIELD_SEPARATOR = "\x1f"
+
+
+def _build_search_buffer(values: List[str]) -> Tuple[str, List[int]]:
+    """Join column values into one string plus the start offset of each row."""
+    starts: List[int] = []
+    offset = 0
+    for value in values:
+        starts.append(offset)
+        offset += len(value) + 1
+    return _ROW_SEPARATOR.join(values), starts
+
+
+def _scan_search_buffer(text: str, starts: List[int], q: str, limit: int) -> List[int]:
+    """
+    Indices of the first `limit` rows whose value contains q, found with
+    str.find over the buffer (rows come out in ascending order).
+    """
+    rows: List[int] = []
+    pos = text.find(q)
+    while pos != -1:
+        row = bisect_right(starts, pos) - 1
+        rows.append(row)
+        # Skip the rest of a matching row; stop once enough rows are found
+        if len(rows) >= limit or row + 1 == len(starts):
+            break
+        pos = text.find(q, starts[row + 1])
+    return rows
 
 
 class DataManager:
@@ -28,6 +81,29 @@ class DataManager:
     ) -> None:
         self.encoding = encoding
         self.data_sources: Dict[str, pd.DataFrame] = {}
+        # Lowercased Category/Question/Answer of every row in one contiguous
+        # buffer (plus row start offsets), built once per load
+        self._faq_search: Tuple[str, List[int]] = ("", [])
+        # Lowercased category -> positional row indices of its FAQ entries
+        self._category_rows: Dict[str, np.ndarray] = {}
+        # Bumped on every successful FAQ load; caches built from the FAQ
+        # frame key on it
+        self.faq_generation = 0
+
+        # Index freshness is re-checked at most every FAQ_INDEX_CHECK_INTERVAL
+        # seconds; uploaded-file indexes known to exist are not re-listed
+        self._faq_index_ok = False
+        self._faq_index_checked_at = 0.0
+        self._faq_index_lock = threading.Lock()
+        self._uploaded_index_seen: Set[str] = set()
+        # Uploaded CSV metadata (mtime, rows, columns), refreshed when a file changes
+        self._uploaded_meta: Dict[Path, Tuple[float, int, List[str]]] = {}
+
+        # Concurrent FAQ queries share one embeddings request and FAISS search
+        self._faq_batcher = SearchBatcher(vector_search, "company_faqs")
+        # search_faqs results by (normalized query, limit); cleared on rebuild
+        self._faq_search_cache: TTLCache = TTLCache(maxsize=1024, ttl=FAQ_SEARCH_CACHE_TTL)
+        self._faq_search_cache_lock = threading.Lock()
         
         # Absolute path to CSV relative to this file's location
         current_file = Path(__file__).resolve()
@@ -40,6 +116,9 @@ class DataManager:
 
         logger.info(f"FAQ path: {self.company_faqs_path}") 
 
+        # Print a sample of the loaded FAQ frame (pandas repr is not free)
+        self.debug = bool(int(os.getenv("DATAMANAGER_DEBUG", "0")))
+
         # Allow path overrides via environment variables (optional)
         env_override = os.getenv("COMPANY_FAQS_PATH")
         if env_override:
@@ -56,19 +135,36 @@ class DataManager:
     # -------------------
     def _read_csv_with_fallback(self, path: Path) -> pd.DataFrame:
         """
-        Try reading CSV first with sep=';', then with sep=','.
-
+        Read the FAQ columns of a CSV with pyarrow. The separator (';' or ',')
+        is sniffed from the header line instead of re-parsing the whole file
+        for each candidate. Other columns are skipped, and text columns come
+        back as string[pyarrow] without type inference.
         """
-        last_err: Optional[Exception] = None
-
-        for sep in (";", ","):
-            try:
-                return pd.read_csv(path, sep=sep, encoding=self.encoding)
-            except Exception as e:
-                last_err = e  # try next separator
+        try:
+            with open(path, "rb") as f:
+                header = f.readline()
+            sep = ";" if header.count(b";") > header.count(b",") else ","
+            header_cols = next(
+                csv.reader([header.decode(self.encoding).lstrip("\ufeff").rstrip("\r\n")], delimiter=sep),
+                [],
+            )
+            columns = [c for c in header_cols if c in FAQ_COLUMNS]
 
-        # If we reached here, both methods failed
-        raise RuntimeError(f"Failed to read CSV at {path}: {last_err}")
+            table = pa_csv.read_csv(
+                path,
+                read_options=pa_csv.ReadOptions(encoding=self.encoding),
+                parse_options=pa_csv.ParseOptions(delimiter=sep, newlines_in_values=True),
+                convert_options=pa_csv.ConvertOptions(
+                    include_columns=columns,
+                    column_types={c: pa.string() for c in FAQ_TEXT_COLUMNS if c in columns},
+                ),
+            )
+            string_dtype = pd.StringDtype("pyarrow")
+            return table.to_pandas(
+                types_mapper=lambda t: string_dtype if t == pa.string() else None
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to read CSV at {path}: {e}")
 
     def load_company_faqs(self) -> None:
         """Load FAQ from CSV into memory."""
@@ -77,51 +173,82 @@ class DataManager:
                 df = self._read_csv_with_fallback(self.company_faqs_path)
 
                 # Normalize expected columns (minimal contract)
-                expected = {"Category", "Question", "Answer"}
-                missing = expected - set(df.columns)
+                missing = set(FAQ_TEXT_COLUMNS) - set(df.columns)
                 if missing:
                     raise ValueError(
                         f"CSV {self.company_faqs_path} is missing required columns: {sorted(missing)}"
                     )
 
-                # Convert strings to str (in case of NaN) to avoid errors with .str.lower()
-                for col in ("Category", "Question", "Answer"):
-                    df[col] = df[col].astype(str)
+                # Text columns are already string[pyarrow] (one UTF-8 buffer per
+                # column, never null since empty cells parse as "")
+
+                # Categories as a categorical (first-appearance order), with a
+                # lookup of rows per lowercased category
+                df["Category"] = pd.Categorical(
+                    df["Category"], categories=df["Category"].unique()
+                )
+                self._category_rows = dict(
+                    df.groupby(df["Category"].str.lower(), sort=False).indices
+                )
 
                 self.data_sources["company_faqs"] = df
+                blob = df["Category"].astype("string[pyarrow]")
+                for col in FAQ_TEXT_COLUMNS[1:]:
+                    blob = blob + _FIELD_SEPARATOR + df[col]
+                self._faq_search = _build_search_buffer(blob.str.lower().tolist())
+                self.faq_generation += 1
 
-                print(
+                logger.info(
                     f"Loaded {len(df)} FAQ records from {self.company_faqs_path}"
                 )
                 # Small sample for visual inspection
-                with pd.option_context("display.max_colwidth", 120):
-                    print("Sample data:")
-                    print(df.head(2))
+                if self.debug:
+                    with pd.option_context("display.max_colwidth", 120):
+                        logger.debug("Sample data:\n%s", df.head(2))
             else:
-                print(f"company_faqs.csv not found at: {self.company_faqs_path}")
+                logger.warning(f"company_faqs.csv not found at: {self.company_faqs_path}")
         except Exception as e:
-            print(f"Error loading company_faqs.csv from {self.company_faqs_path}: {e}")
+            logger.error(f"Error loading company_faqs.csv from {self.company_faqs_path}: {e}")
     
     # Check and create vector index
     def _ensure_faq_index(self) -> None:
         """Check existence and freshness of vector index for FAQ."""
+        now = time.monotonic()
+        if self._faq_index_ok and now - self._faq_index_checked_at < FAQ_INDEX_CHECK_INTERVAL:
+            return
+
+        # One thread checks/rebuilds at a time; the others keep serving the
+        # current index instead of queueing behind it (or wait if there is none)
+        if not self._faq_index_lock.acquire(blocking=not self._faq_index_ok):
+            return
         try:
+            if self._faq_index_ok and time.monotonic() - self._faq_index_checked_at < FAQ_INDEX_CHECK_INTERVAL:
+                return
+
             index_exists = False
             for index_info in vector_search.list_indexes():
                 if index_info['id'] == 'company_faqs':
                     index_exists = True
                     break
-            
+        
             # If index does not exist or FAQ file is newer, create a new index
             if not index_exists or (
                 self.company_faqs_path.exists() and 
                 self.company_faqs_path.stat().st_mtime > vector_search.last_updated.get('company_faqs', 0)
             ):
-                print("Building vector index for company FAQs...")
+                logger.info("Building vector index for company FAQs...")
                 vector_search.build_index_for_company_faqs(str(self.company_faqs_path))
-        
+                self._faq_index_ok = "company_faqs" in vector_search.indexes
+                with self._faq_search_cache_lock:
+                    self._faq_search_cache.clear()
+            else:
+                self._faq_index_ok = True
+            self._faq_index_checked_at = now
+    
         except Exception as e:
-            print(f"Error ensuring FAQ index: {e}")
+            logger.error(f"Error ensuring FAQ index: {e}")
+        finally:
+            self._faq_index_lock.release()
 
     # -------------------
     # Search and queries
@@ -138,21 +265,32 @@ class DataManager:
         Returns:
             List of found FAQs with relevance scores
         """
+        # Normalisation only shapes the cache key; the search gets the query
+        # as the user wrote it
+        key = ((query or "").strip().lower(), limit)
+        with self._faq_search_cache_lock:
+            cached = self._faq_search_cache.get(key)
+        if cached is not None:
+            # Fresh records per call, so callers may annotate their results
+            return [dict(record) for record in cached]
+
         try:
             # Check for index and try vector search
             self._ensure_faq_index()
-            results = vector_search.search(query, 'company_faqs', top_k=limit)
+            results = self._faq_batcher.search(query, top_k=limit)
             
-            # If vector search yields results, return them
-            if results:
-                return results
-                
             # If no results, use traditional search
-            print("No vector search results, falling back to text search")
-            return self._fallback_text_search(query, limit)
+            if not results:
+                logger.info("No vector search results, falling back to text search")
+                results = self._fallback_text_search(query, limit)
+
+            # Only successful searches are cached, not the error fallback below
+            with self._faq_search_cache_lock:
+                self._faq_search_cache[key] = tuple(dict(record) for record in results)
+            return results
             
         except Exception as e:
-            print(f"Error in vector search: {e}")
+            logger.error(f"Error in vector search: {e}")
             # In case of vector search error, use text search
             return self._fallback_text_search(query, limit)
     
@@ -163,16 +301,15 @@ class DataManager:
             return []
 
         q = (query or "").strip().lower()
-        if not q:
+        if not q or _ROW_SEPARATOR in q or _FIELD_SEPARATOR in q:
             return []
 
-        mask = (
-            df["Question"].str.lower().str.contains(q, na=False)
-            | df["Answer"].str.lower().str.contains(q, na=False)
-            | df["Category"].str.lower().str.contains(q, na=False)
-        )
+        # Plain substring match: one C-level scan over the row buffer, which
+        # yields matching rows in order and stops after `limit` of them
+        text, starts = self._faq_search
+        rows = _scan_search_buffer(text, starts, q, limit)
 
-        results = df[mask].head(limit)
+        results = df.iloc[rows[:limit]]
         records = results.to_dict("records")
         
         # Add dummy relevance score for compatibility with vector search
@@ -191,28 +328,31 @@ class DataManager:
             # Form source identifier
             source_id = f"uploaded_{file_id}"
             
-            # Check for index existence
-            index_exists = False
-            for index_info in vector_search.list_indexes():
-                if index_info['id'] == source_id:
-                    index_exists = True
-                    break
+            # Check for index existence (once per file; indexes are never removed)
+            index_exists = source_id in self._uploaded_index_seen
+            if not index_exists:
+                for index_info in vector_search.list_indexes():
+                    if index_info['id'] == source_id:
+                        index_exists = True
+                        break
             
             # If index does not exist, create it
             if not index_exists:
                 file_path = self.upload_dir / f"{file_id}.csv"
                 if file_path.exists():
-                    print(f"Building vector index for uploaded file {file_id}...")
+                    logger.info(f"Building vector index for uploaded file {file_id}...")
                     vector_search.build_index_for_uploaded_file(file_id, str(file_path))
                 else:
-                    print(f"File not found: {file_id}")
+                    logger.warning(f"File not found: {file_id}")
                     return []
             
+            if index_exists or source_id in vector_search.indexes:
+                self._uploaded_index_seen.add(source_id)
             results = vector_search.search(query, source_id, top_k=limit)
             return results
             
         except Exception as e:
-            print(f"Error in search_uploaded_file: {e}")
+            logger.error(f"Error in search_uploaded_file: {e}")
             return []
 
     def get_all_data_sources(self) -> Dict[str, Any]:
@@ -220,6 +360,8 @@ class DataManager:
         Metadata for all loaded data sources
         """
         info: Dict[str, Any] = {}
+        # One listing of the index directory serves every source below
+        existing_indexes = {idx["id"] for idx in vector_search.list_indexes()}
         
         # Process standard data sources
         for name, df in self.data_sources.items():
@@ -227,7 +369,7 @@ class DataManager:
                 "records_count": int(len(df)),
                 "columns": list(df.columns),
                 "path": str(self.company_faqs_path) if name == "company_faqs" else None,
-                "has_vector_index": name in {idx["id"] for idx in vector_search.list_indexes()}
+                "has_vector_index": name in existing_indexes
             }
         
         # Add uploaded user files
@@ -236,20 +378,45 @@ class DataManager:
             source_id = f"uploaded_{file_id}"
             
             try:
-                df = pd.read_csv(file_path)
+                records_count, columns = self._uploaded_file_meta(file_path)
                 info[source_id] = {
                     "name": f"Uploaded: {file_path.name}",
                     "type": "csv_uploaded",
-                    "records_count": len(df),
-                    "columns": list(df.columns),
+                    "records_count": records_count,
+                    "columns": columns,
                     "path": str(file_path),
-                    "has_vector_index": source_id in {idx["id"] for idx in vector_search.list_indexes()}
+                    "has_vector_index": source_id in existing_indexes
                 }
             except Exception as e:
-                print(f"Error reading uploaded file {file_path}: {e}")
+                logger.error(f"Error reading uploaded file {file_path}: {e}")
         
         return info
 
+    def _uploaded_file_meta(self, file_path: Path) -> Tuple[int, List[str]]:
+        """
+        Row count and column names of an uploaded CSV without parsing it:
+        the header line is split with csv.reader and the remaining lines are
+        counted by newlines. Cached until the file's mtime changes.
+        """
+        mtime = file_path.stat().st_mtime
+        cached = self._uploaded_meta.get(file_path)
+        if cached and cached[0] == mtime:
+            return cached[1], cached[2]
+
+        records_count = 0
+        last_chunk = b"\n"
+        with open(file_path, "rb") as f:
+            header = f.readline()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                records_count += chunk.count(b"\n")
+                last_chunk = chunk
+        if not last_chunk.endswith(b"\n"):
+            records_count += 1  # last row without a trailing newline
+
+        columns = next(csv.reader([header.decode(self.encoding).lstrip("\ufeff").rstrip("\r\n")]), [])
+        self._uploaded_meta[file_path] = (mtime, records_count, columns)
+        return records_count, columns
+
     def get_faq_by_category(self, category: str) -> List[Dict[str, Any]]:
         """Return all FAQ entries with an exact category match (case insensitive)."""
         df = self.data_sources.get("company_faqs")
@@ -259,21 +426,33 @@ class DataManager:
         if not c:
             return []
         
-        results = df[df["Category"].str.lower() == c]
-        return results.to_dict("records")
+        rows = self._category_rows.get(c)
+        if rows is None:
+            return []
+        return df.iloc[rows].to_dict("records")
 
     def get_all_categories(self) -> List[str]:
         """List of unique categories (as they appear in the data)."""
         df = self.data_sources.get("company_faqs")
         if df is None or df.empty:
             return []
-        # Remove empty/NaN, convert to str
-        cats = df["Category"].dropna().astype(str).unique().tolist()
-        return cats
+        # Categories are fixed at load time (already str, in order of appearance);
+        # a plain column only happens if the frame was replaced from outside
+        cats = df["Category"]
+        if hasattr(cats, "cat"):
+            return cats.cat.categories.tolist()
+        return cats.dropna().astype(str).unique().tolist()
 
 
     def reload(self) -> None:
         """Reload data from CSV and update vector indexes."""
         self.load_company_faqs()
-        # Update vector index after reloading data
-        self._ensure_faq_index()
\ No newline at end of file
+        with self._faq_search_cache_lock:
+            self._faq_search_cache.clear()
+        # Update vector index after reloading data (bypassing the check interval)
+        self._faq_index_ok = False
+        self._ensure_faq_index()
+
+
+# Shared instance: FAQ frame, search buffers and the batcher are loaded once
+data_manager = DataManager()
@@ -1,18 +1,31 @@
 from __future__ import annotations
 
-import json
+import atexit
 import logging
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Set, Tuple
 from datetime import datetime
 from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, partial
 
-from sqlalchemy import create_engine, text, func, case
+import orjson
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
+
+from sqlalchemy import (
+    bindparam, create_engine, event, insert, select, update, union_all, text, func, case,
+    column, literal, null, and_, or_, Integer,
+)
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import sessionmaker, Session, joinedload
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import sessionmaker, Session
 
 from app.models import Base
+from app.models.base import utc_now
 from app.models.user import User as SQLUser
 from app.models.chat import ChatSession as SQLChatSession, ChatMessage as SQLChatMessage, ChatLog as SQLChatLog
 from app.schemas.user import UserCreate, User as PydanticUser
@@ -25,6 +38,114 @@ from app.schemas.chat import (
 
 logger = logging.getLogger(__name__)
 
+# Legacy chat logs are buffered and written in batches of up to this many
+# rows, or after this many seconds, whichever comes first
+LOG_FLUSH_ROWS = 100
+LOG_FLUSH_INTERVAL = 1.0
+
+# last_login timestamps are collected per user and written together after
+# this many seconds
+LOGIN_FLUSH_INTERVAL = 5.0
+
+# Table counts for get_database_stats are reused for this many seconds
+DB_STATS_CACHE_TTL = 5
+
+_db_stats_cache: TTLCache = TTLCache(maxsize=1, ttl=DB_STATS_CACHE_TTL)
+_db_stats_cache_lock = threading.Lock()
+
+# Per-user chat statistics are reused for this many seconds; writes that
+# change them drop the user's entry once their transaction commits
+USER_STATS_CACHE_TTL = 30
+
+# Messages are fetched from the cursor and converted this many at a time
+MESSAGE_FETCH_BATCH = 200
+
+# Length of the last-message preview shown in chat lists
+MESSAGE_PREVIEW_LENGTH = 100
+
+# Applied to every new SQLite connection: WAL lets readers run alongside a
+# writer, NORMAL sync skips the per-commit fsync of the WAL, and the cache /
+# mmap sizes keep hot pages in memory.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+# Correlated per-session subqueries for chat lists: message count and the
+# newest message's text cut to one char past the preview length (answered by
+# ix_chat_messages_chat_id / ix_chat_messages_chat_created, one lookup per
+# listed session). Built once; the statement cache keys on their structure.
+_CHAT_MESSAGE_COUNT = (
+    select(func.count())
+    .where(SQLChatMessage.chat_id == SQLChatSession.id)
+    .correlate(SQLChatSession)
+    .scalar_subquery()
+)
+# Columns of a chat summary, selected as plain rows (no ORM entity or
+# identity-map bookkeeping) for the list and single-chat reads
+_CHAT_SUMMARY_COLUMNS = (
+    SQLChatSession.id,
+    SQLChatSession.user_id,
+    SQLChatSession.title,
+    SQLChatSession.created_at,
+    SQLChatSession.updated_at,
+    SQLChatSession.is_archived,
+    SQLChatSession.is_pinned,
+    SQLChatSession.is_incognito,
+)
+_CHAT_LAST_MESSAGE = (
+    select(func.substr(SQLChatMessage.content, 1, MESSAGE_PREVIEW_LENGTH + 1))
+    .where(SQLChatMessage.chat_id == SQLChatSession.id)
+    .order_by(SQLChatMessage.created_at.desc(), SQLChatMessage.id.desc())
+    .limit(1)
+    .correlate(SQLChatSession)
+    .scalar_subquery()
+)
+
+
+# Session of the enclosing session_scope(), if any. get_session() hands it out
+# instead of opening a new one, so helpers called inside a scope share a single
+# transaction and commit once when the scope ends.
+_current_session: ContextVar[Optional[Session]] = ContextVar("db_session", default=None)
+
+
+def _dump_json(value: Any) -> str:
+    """JSON text for a TEXT column (orjson; non-str keys converted like json.dumps)."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _load_metadata(raw: Optional[str]) -> Dict[str, Any]:
+    """Decode a message_metadata column; missing or invalid JSON gives {}."""
+    if not raw:
+        return {}
+    try:
+        value = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return {}
+    return value if isinstance(value, dict) else {}
+
+
+def _message_preview(content: Optional[str]) -> Optional[str]:
+    if content is None:
+        return None
+    if len(content) > MESSAGE_PREVIEW_LENGTH:
+        return content[:MESSAGE_PREVIEW_LENGTH] + "..."
+    return content
+
 
 class DatabaseManager:
     """
@@ -46,14 +167,66 @@ class DatabaseManager:
         self.engine = create_engine(
             self.db_url,
             echo=False,
-            connect_args={"check_same_thread": False}
+            connect_args={"check_same_thread": False},
+            # Reuse open connections (and their page cache) across sessions;
+            # LIFO hands out the most recently used, warmest one first
+            poolclass=QueuePool,
+            pool_size=5,
+            max_overflow=10,
+            pool_recycle=3600,
+            pool_pre_ping=False,
+            pool_use_lifo=True,
+            # Room for every distinct statement shape, so none gets recompiled
+            query_cache_size=1200,
         )
+        event.listen(self.engine, "connect", _apply_sqlite_pragmas)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+        # get_user_statistics results of this database. Writes mark the owner
+        # in session.info and the entry is dropped after the commit; every
+        # drop bumps the generation, so a read whose snapshot predates the
+        # commit does not store its older counts.
+        self._user_stats_cache: TTLCache = TTLCache(maxsize=1024, ttl=USER_STATS_CACHE_TTL)
+        self._user_stats_cache_lock = threading.Lock()
+        self._user_stats_generation = 0
+        event.listen(self.SessionLocal, "after_commit", self._drop_stale_user_stats)
+        event.listen(self.SessionLocal, "after_rollback", self._forget_stale_user_stats)
+
         self._check_and_apply_migrations()
+        self._fts_enabled = self._has_schema_objects("chat_messages_fts", "chat_sessions_fts")
+        self._touch_trigger_enabled = self._has_schema_objects("msg_touch_chat")
+        self._log_journal_mode()
+
+        # Pending chat_logs rows; flushed by size, by timer and at exit
+        self._log_buffer: List[Dict[str, Any]] = []
+        self._log_lock = threading.Lock()
+        self._log_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush_chat_logs)
+
+        # Users with a pending last_login bump; flushed by timer and at exit
+        self._login_buffer: Set[int] = set()
+        self._login_lock = threading.Lock()
+        self._login_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush_last_logins)
 
     @contextmanager
     def get_session(self) -> Session:
         """Get SQLAlchemy session with automatic cleanup."""
+        current = _current_session.get()
+        if current is not None:
+            # Inside session_scope(): the scope commits/rolls back and closes.
+            # Helpers log and swallow their errors, so a failure is recorded
+            # here: later helpers in the scope fail fast with it and the
+            # scope re-raises it instead of committing a broken session.
+            failed = current.info.get("scope_error")
+            if failed is not None:
+                raise failed
+            try:
+                yield current
+            except Exception as e:
+                current.info["scope_error"] = e
+                raise
+            return
         session = self.SessionLocal()
         try:
             yield session
@@ -64,6 +237,26 @@ class DatabaseManager:
         finally:
             session.close()
 
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """
+        One session (and transaction) shared by every get_session() call made
+        inside the block in the current context; committed once at the end.
+        """
+        current = _current_session.get()
+        if current is not None:
+            yield current
+            return
+        with self.get_session() as session:
+            token = _current_session.set(session)
+            try:
+                yield session
+                failed = session.info.pop("scope_error", None)
+                if failed is not None:
+                    raise failed
+            finally:
+                _current_session.reset(token)
+
     def _check_and_apply_migrations(self) -> None:
         try:
             from app.database.migration_manager import initialize_migration_manager, get_migration_manager
@@ -84,6 +277,32 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Migration check failed: {e}")
 
+    def _has_schema_objects(self, *names: str) -> bool:
+        """Whether all named tables/triggers from the migrations are present."""
+        try:
+            with self.engine.connect() as connection:
+                found = connection.execute(
+                    select(func.count())
+                    .select_from(text("sqlite_master"))
+                    .where(column("name").in_(names))
+                ).scalar()
+            return found == len(names)
+        except Exception as e:
+            logger.warning(f"Could not check schema objects {names}: {e}")
+            return False
+
+    def _log_journal_mode(self) -> None:
+        """Report the journal mode once; WAL silently falls back on some filesystems."""
+        try:
+            with self.engine.connect() as connection:
+                mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+            if str(mode).lower() == "wal":
+                logger.info("SQLite journal_mode: %s", mode)
+            else:
+                logger.warning("SQLite journal_mode is %s, not WAL; readers will block behind writes", mode)
+        except Exception as e:
+            logger.warning(f"Could not read SQLite journal_mode: {e}")
+
     # ---------------------------
     # User Management
     # ---------------------------
@@ -91,29 +310,31 @@ class DatabaseManager:
     def create_user(self, user_data: UserCreate) -> Optional[PydanticUser]:
         try:
             with self.get_session() as session:
-                existing_user = session.query(SQLUser).filter_by(
-                    oauth_provider=user_data.oauth_provider,
-                    oauth_id=user_data.oauth_id
-                ).first()
-                
-                if existing_user:
-                    return self._sqlalchemy_user_to_pydantic(existing_user)
-                
-                db_user = SQLUser(
-                    email=user_data.email,
-                    name=user_data.name,
-                    avatar_url=user_data.avatar_url,
-                    oauth_provider=user_data.oauth_provider,
-                    oauth_id=user_data.oauth_id,
-                    provider_data=json.dumps(user_data.provider_data) if user_data.provider_data else None,
-                    is_active=user_data.is_active
+                # Single upsert on uq_provider_oauth_id: a new user is
+                # inserted, an existing one only gets last_login bumped, and
+                # RETURNING hands back the row either way (no SELECT-then-INSERT
+                # race between concurrent first logins)
+                stmt = (
+                    sqlite_insert(SQLUser)
+                    .values(
+                        email=user_data.email,
+                        name=user_data.name,
+                        avatar_url=user_data.avatar_url,
+                        oauth_provider=user_data.oauth_provider,
+                        oauth_id=user_data.oauth_id,
+                        provider_data=_dump_json(user_data.provider_data) if user_data.provider_data else None,
+                        is_active=user_data.is_active
+                    )
+                    .on_conflict_do_update(
+                        index_elements=["oauth_provider", "oauth_id"],
+                        set_={"last_login": utc_now}
+                    )
+                    .returning(SQLUser)
                 )
+                db_user = session.execute(stmt).scalar_one()
                 
-                session.add(db_user)
-                session.flush()
-                session.refresh(db_user)
-                
-                logger.info(f"Created user: {user_data.email}")
+                if db_user.last_login is None:
+                    logger.info(f"Created user: {user_data.email}")
                 return self._sqlalchemy_user_to_pydantic(db_user)
                 
         except Exception as e:
@@ -123,12 +344,12 @@ class DatabaseManager:
     def get_user_by_id(self, user_id: int) -> Optional[PydanticUser]:
         try:
             with self.get_session() as session:
-                db_user = session.query(SQLUser).filter_by(
-                    id=user_id, 
-                    is_active=True
-                ).first()
+                # Primary-key fast path (identity map, then a PK lookup)
+                db_user = session.get(SQLUser, user_id)
                 
-                return self._sqlalchemy_user_to_pydantic(db_user) if db_user else None
+                if db_user is None or not db_user.is_active:
+                    return None
+                return self._sqlalchemy_user_to_pydantic(db_user)
         except Exception as e:
             logger.error(f"Error getting user {user_id}: {e}")
             return None
@@ -137,11 +358,13 @@ class DatabaseManager:
         """Get user by OAuth credentials."""
         try:
             with self.get_session() as session:
-                db_user = session.query(SQLUser).filter_by(
-                    oauth_provider=provider,
-                    oauth_id=oauth_id,
-                    is_active=True
-                ).first()
+                db_user = session.execute(
+                    select(SQLUser).where(
+                        SQLUser.oauth_provider == provider,
+                        SQLUser.oauth_id == oauth_id,
+                        SQLUser.is_active.is_(True)
+                    )
+                ).scalars().first()
                 
                 return self._sqlalchemy_user_to_pydantic(db_user) if db_user else None
                 
@@ -154,10 +377,9 @@ class DatabaseManager:
     def get_user_by_email(self, email: str) -> Optional[PydanticUser]:
         try:
             with self.get_session() as session:
-                db_user = session.query(SQLUser).filter_by(
-                    email=email,
-                    is_active=True
-                ).first()
+                db_user = session.execute(
+                    select(SQLUser).where(SQLUser.email == email, SQLUser.is_active.is_(True))
+                ).scalars().first()
                 
                 return self._sqlalchemy_user_to_pydantic(db_user) if db_user else None
                 
@@ -167,16 +389,37 @@ class DatabaseManager:
         
 
     def update_last_login(self, user_id: int) -> bool:
+        """Record a login; written to the database within LOGIN_FLUSH_INTERVAL."""
+        with self._login_lock:
+            self._login_buffer.add(user_id)
+            if self._login_timer is None:
+                self._login_timer = threading.Timer(LOGIN_FLUSH_INTERVAL, self.flush_last_logins)
+                self._login_timer.daemon = True
+                self._login_timer.start()
+        return True
+
+    def flush_last_logins(self) -> None:
+        """Write buffered last_login values with one batched UPDATE."""
+        with self._login_lock:
+            pending, self._login_buffer = self._login_buffer, set()
+            if self._login_timer is not None:
+                self._login_timer.cancel()
+                self._login_timer = None
+        if not pending:
+            return
         try:
-            with self.get_session() as session:
-                session.query(SQLUser).filter_by(id=user_id).update(
-                    {"last_login": datetime.utcnow()}
+            # Core executemany: ids that no longer exist are simply skipped.
+            # Stamped with utc_now like every other timestamp column; the
+            # flush runs at most LOGIN_FLUSH_INTERVAL after the login
+            with self.engine.begin() as connection:
+                connection.execute(
+                    update(SQLUser.__table__)
+                    .where(SQLUser.__table__.c.id == bindparam("user_id"))
+                    .values(last_login=utc_now),
+                    [{"user_id": user_id} for user_id in pending]
                 )
-                return True
-                
         except Exception as e:
             logger.error(f"Error updating last login: {e}")
-            return False
 
     # ---------------------------
     # Chat Management
@@ -199,8 +442,8 @@ class DatabaseManager:
                 
                 session.add(db_session)
                 session.flush()
-                session.refresh(db_session)
                 
+                self._mark_user_stats_stale(session, user_id)
                 logger.info(f"Created chat session {db_session.id}")
                 return self._sqlalchemy_session_to_pydantic(db_session)
                 
@@ -218,7 +461,7 @@ class DatabaseManager:
     ) -> Optional[PydanticChatSession]:
         try:
             with self.get_session() as session:
-                chat = session.query(SQLChatSession).filter_by(id=chat_id).first()
+                chat = session.get(SQLChatSession, chat_id)
                 if not chat:
                     return None
                 
@@ -231,9 +474,9 @@ class DatabaseManager:
                 if is_incognito is not None:
                     chat.is_incognito = is_incognito    
                     
-                chat.updated_at = datetime.utcnow()
+                # updated_at is bumped by the column's onupdate on flush
                 session.flush()
-                session.refresh(chat)
+                self._mark_user_stats_stale(session, chat.user_id)
                 
                 return self._sqlalchemy_session_to_pydantic(chat)
                 
@@ -244,9 +487,10 @@ class DatabaseManager:
     def delete_chat_session(self, chat_id: int) -> bool:
         try:
             with self.get_session() as session:
-                chat = session.query(SQLChatSession).filter_by(id=chat_id).first()
+                chat = session.get(SQLChatSession, chat_id)
                 if chat:
                     session.delete(chat)  
+                    self._mark_user_stats_stale(session, chat.user_id)
                     return True
                 return False
                 
@@ -264,20 +508,28 @@ class DatabaseManager:
         """Add message to chat."""
         try:
             with self.get_session() as session:
-                db_message = SQLChatMessage(
-                    chat_id=chat_id,
-                    role=role,
-                    content=content,
-                    message_metadata=json.dumps(metadata) if metadata else None
-                )
+                # INSERT ... RETURNING gives back the stored row in the same
+                # statement; the msg_touch_chat trigger bumps the chat's
+                # updated_at (explicit UPDATE only on databases without it)
+                db_message = session.execute(
+                    insert(SQLChatMessage)
+                    .values(
+                        chat_id=chat_id,
+                        role=role,
+                        content=content,
+                        message_metadata=_dump_json(metadata) if metadata else None
+                    )
+                    .returning(SQLChatMessage)
+                ).scalar_one()
                 
-                session.add(db_message)
-                session.flush()
-                session.refresh(db_message)
+                if not self._touch_trigger_enabled:
+                    session.query(SQLChatSession).filter_by(id=chat_id).update(
+                        {"updated_at": utc_now}
+                    )
                 
-                session.query(SQLChatSession).filter_by(id=chat_id).update(
-                    {"updated_at": datetime.utcnow()}
-                )
+                self._mark_user_stats_stale(session, session.scalar(
+                    select(SQLChatSession.user_id).where(SQLChatSession.id == chat_id)
+                ))
                 
                 return self._sqlalchemy_message_to_pydantic(db_message)
                 
@@ -294,24 +546,30 @@ class DatabaseManager:
     ) -> List[PydanticChatSession]:
         try:
             with self.get_session() as session:
-                query = session.query(SQLChatSession).filter_by(user_id=user_id)
+                stmt = select(
+                    *_CHAT_SUMMARY_COLUMNS,
+                    _CHAT_MESSAGE_COUNT.label("message_count"),
+                    _CHAT_LAST_MESSAGE.label("last_message"),
+                ).where(SQLChatSession.user_id == user_id)
                 
                 if not include_archived:
-                    query = query.filter_by(is_archived=False)
-
-                query = query.options(joinedload(SQLChatSession.messages))
+                    stmt = stmt.where(SQLChatSession.is_archived == False)
                 
-                db_sessions = (
-                    query.order_by(
+                rows = session.execute(
+                    stmt.order_by(
                         SQLChatSession.is_pinned.desc(),
                         SQLChatSession.updated_at.desc()
                     )
                     .offset(offset)
                     .limit(limit)
-                    .all()
-                )
+                ).all()
                 
-                return [self._sqlalchemy_session_to_pydantic_with_loaded_messages(s) for s in db_sessions]
+                return [
+                    self._session_summary_to_pydantic(
+                        row, row.message_count, _message_preview(row.last_message)
+                    )
+                    for row in rows
+                ]
                 
         except Exception as e:
             logger.error(f"Error getting sessions: {e}")
@@ -321,28 +579,95 @@ class DatabaseManager:
         self, 
         chat_id: int, 
         limit: Optional[int] = None,
-        offset: int = 0
+        offset: int = 0,
+        include_metadata: bool = True
     ) -> List[PydanticMessage]:
+        """
+        Messages of a chat, oldest first. With include_metadata=False the
+        metadata column is not selected and messages carry an empty dict.
+        """
         try:
             with self.get_session() as session:
-                query = (
-                        session.query(SQLChatMessage)
-                        .filter_by(chat_id=chat_id)
-                        .order_by(SQLChatMessage.created_at.asc())
-                        .offset(offset)
-                    )
-
+                stmt = self._chat_messages_stmt(chat_id, include_metadata).offset(offset)
                 if limit is not None:
-                        query = query.limit(limit)
+                        stmt = stmt.limit(limit)
 
-                db_messages = query.all()
-                
-                return [self._sqlalchemy_message_to_pydantic(msg) for msg in db_messages]
+                # Rows are fetched and converted MESSAGE_FETCH_BATCH at a time,
+                # so raw rows and messages are never both held in full
+                messages: List[PydanticMessage] = []
+                for batch in self._iter_message_batches(session, stmt, include_metadata):
+                    messages.extend(batch)
+                return messages
                 
         except Exception as e:
             logger.error(f"Error getting messages: {e}")
             return []
 
+    def iter_chat_messages(
+        self, chat_id: int, batch_size: int = MESSAGE_FETCH_BATCH
+    ) -> Iterator[PydanticMessage]:
+        """
+        Yield chat messages oldest-first, `batch_size` at a time. Each page is
+        read in its own short session (keyset on created_at, id), so nothing
+        stays open while the caller consumes it. Errors propagate, letting a
+        streaming response report them instead of ending silently.
+        """
+        after: Optional[Tuple[Any, int]] = None
+        while True:
+            with self.get_session() as session:
+                stmt = self._chat_messages_stmt(chat_id, include_metadata=True)
+                if after is not None:
+                    created_at, message_id = after
+                    stmt = stmt.where(or_(
+                        SQLChatMessage.created_at > created_at,
+                        and_(SQLChatMessage.created_at == created_at, SQLChatMessage.id > message_id),
+                    ))
+                page = [
+                    message
+                    for batch in self._iter_message_batches(session, stmt.limit(batch_size), True, batch_size)
+                    for message in batch
+                ]
+            yield from page
+            if len(page) < batch_size:
+                return
+            after = (page[-1].created_at, page[-1].id)
+
+    def _chat_messages_stmt(self, chat_id: int, include_metadata: bool):
+        # Plain column rows (no ORM entities), turned into messages with
+        # model_construct: they come straight from the DB
+        columns = [
+            SQLChatMessage.id,
+            SQLChatMessage.chat_id,
+            SQLChatMessage.role,
+            SQLChatMessage.content,
+            SQLChatMessage.created_at
+        ]
+        if include_metadata:
+            columns.append(SQLChatMessage.message_metadata)
+        return (
+            select(*columns)
+            .where(SQLChatMessage.chat_id == chat_id)
+            .order_by(SQLChatMessage.created_at.asc(), SQLChatMessage.id.asc())
+        )
+
+    def _iter_message_batches(
+        self,
+        session: Session,
+        stmt: Any,
+        include_metadata: bool,
+        batch_size: int = MESSAGE_FETCH_BATCH
+    ) -> Iterator[List[PydanticMessage]]:
+        result = session.execute(stmt.execution_options(yield_per=batch_size))
+        for rows in result.partitions():
+            if include_metadata:
+                metadata = list(map(_load_metadata, [row.message_metadata for row in rows]))
+            else:
+                metadata = [{} for _ in rows]
+            yield [
+                self._message_row_to_pydantic(row, meta)
+                for row, meta in zip(rows, metadata)
+            ]
+
     def search_chats(
         self,
         user_id: int,
@@ -355,72 +680,87 @@ class DatabaseManager:
             with self.get_session() as session:
                 search_pattern = f"%{query}%"
                 
-                results = []
-                seen_chat_ids = set()
+                # Substring match through the trigram FTS5 tables (an index
+                # lookup) when present, plain ILIKE scans otherwise
+                if self._fts_enabled:
+                    title_match = SQLChatSession.id.in_(
+                        text("SELECT rowid FROM chat_sessions_fts WHERE title LIKE :pattern")
+                        .bindparams(pattern=search_pattern)
+                        .columns(column("rowid", Integer))
+                    )
+                    content_match = SQLChatMessage.id.in_(
+                        text("SELECT rowid FROM chat_messages_fts WHERE content LIKE :pattern")
+                        .bindparams(pattern=search_pattern)
+                        .columns(column("rowid", Integer))
+                    )
+                else:
+                    title_match = SQLChatSession.title.ilike(search_pattern)
+                    content_match = SQLChatMessage.content.ilike(search_pattern)
                 
-                title_query = session.query(SQLChatSession).filter(
+                visible = [
                     SQLChatSession.user_id == user_id,
-                    SQLChatSession.is_incognito == False,  
-                    SQLChatSession.title.ilike(search_pattern)  
-                )
-                
+                    SQLChatSession.is_incognito == False,
+                ]
                 if not include_archived:
-                    title_query = title_query.filter(SQLChatSession.is_archived == False)
+                    visible.append(SQLChatSession.is_archived == False)
                 
-                title_query = title_query.order_by(SQLChatSession.updated_at.desc())
-                
-                for chat in title_query.limit(limit).all():
-                    results.append({
-                        "id": chat.id,
-                        "title": chat.title,
-                        "updated_at": chat.updated_at.isoformat() if chat.updated_at else None,
-                        "match_type": "title",
-                        "is_incognito": False
-                    })
-                    seen_chat_ids.add(chat.id)
-                
-                remaining_limit = limit - len(results)
-                if remaining_limit > 0:
-                    messages_query = (
-                        session.query(SQLChatMessage)
-                        .join(SQLChatSession, SQLChatMessage.chat_id == SQLChatSession.id)
-                        .filter(
-                            SQLChatSession.user_id == user_id,
-                            SQLChatSession.is_incognito == False,   
-                            SQLChatMessage.content.ilike(search_pattern)   
-                        )
+                # One UNION ALL: title hits (priority 0, newest chat first),
+                # then message hits (priority 1, newest message first). The
+                # window keeps each chat's best hit, so a chat matching both
+                # ways is reported once, as a title match.
+                title_hits = select(
+                    SQLChatSession.id.label("chat_id"),
+                    literal(0).label("priority"),
+                    SQLChatSession.updated_at.label("matched_at"),
+                    null().label("matched_content"),
+                ).where(*visible, title_match)
+                message_hits = (
+                    select(
+                        SQLChatMessage.chat_id.label("chat_id"),
+                        literal(1).label("priority"),
+                        SQLChatMessage.created_at.label("matched_at"),
+                        func.substr(SQLChatMessage.content, 1, MESSAGE_PREVIEW_LENGTH + 1).label("matched_content"),
                     )
-                    
-                    if not include_archived:
-                        messages_query = messages_query.filter(
-                            SQLChatSession.is_archived == False
-                        )
-                    
-                    messages_query = messages_query.order_by(
-                        SQLChatMessage.created_at.desc()
+                    .join(SQLChatSession, SQLChatMessage.chat_id == SQLChatSession.id)
+                    .where(*visible, content_match)
+                )
+                hits = union_all(title_hits, message_hits).subquery()
+                ranked = select(
+                    hits,
+                    func.row_number().over(
+                        partition_by=hits.c.chat_id,
+                        order_by=(hits.c.priority, hits.c.matched_at.desc()),
+                    ).label("rank"),
+                ).subquery()
+                
+                rows = session.execute(
+                    select(
+                        SQLChatSession.id,
+                        SQLChatSession.title,
+                        SQLChatSession.updated_at,
+                        ranked.c.priority,
+                        ranked.c.matched_content,
                     )
-                    
-                    for msg in messages_query.limit(remaining_limit * 2).all(): 
-                        if msg.chat_id not in seen_chat_ids:
-                            chat = session.query(SQLChatSession).filter_by(
-                                id=msg.chat_id
-                            ).first()
-                            
-                            if chat:
-                                results.append({
-                                    "id": chat.id,
-                                    "title": chat.title,
-                                    "updated_at": chat.updated_at.isoformat() if chat.updated_at else None,
-                                    "match_type": "message",
-                                    "matched_content": msg.content[:100] + ("..." if len(msg.content) > 100 else ""),
-                                    "is_incognito": False
-                                })
-                                seen_chat_ids.add(msg.chat_id)
-                            
-                            if len(results) >= limit:
-                                break
-                
-                return results[:limit]
+                    .join(ranked, ranked.c.chat_id == SQLChatSession.id)
+                    .where(ranked.c.rank == 1)
+                    .order_by(ranked.c.priority, ranked.c.matched_at.desc())
+                    .limit(limit)
+                ).all()
+                
+                results = []
+                for chat_id, title, updated_at, priority, matched_content in rows:
+                    result = {
+                        "id": chat_id,
+                        "title": title,
+                        "updated_at": updated_at.isoformat() if updated_at else None,
+                        "match_type": "title" if priority == 0 else "message",
+                        "is_incognito": False
+                    }
+                    if priority != 0:
+                        result["matched_content"] = _message_preview(matched_content)
+                    results.append(result)
+                
+                return results
                 
         except Exception as e:
             logger.error(f"Error searching chats: {e}")
@@ -436,33 +776,74 @@ class DatabaseManager:
         assistant_response: str,
         data_source: Optional[str] = None,
     ) -> None:
+        row = {
+            "user_message": user_message,
+            "assistant_response": assistant_response,
+            "data_source": data_source,
+        }
+        rows = None
+        with self._log_lock:
+            self._log_buffer.append(row)
+            if len(self._log_buffer) >= LOG_FLUSH_ROWS:
+                rows = self._take_log_buffer()
+            elif self._log_timer is None:
+                self._log_timer = threading.Timer(LOG_FLUSH_INTERVAL, self.flush_chat_logs)
+                self._log_timer.daemon = True
+                self._log_timer.start()
+        if rows:
+            self._write_chat_logs(rows)
+
+    def flush_chat_logs(self) -> None:
+        """Write any buffered chat_logs rows now."""
+        with self._log_lock:
+            rows = self._take_log_buffer()
+        if rows:
+            self._write_chat_logs(rows)
+
+    def _take_log_buffer(self) -> List[Dict[str, Any]]:
+        # Caller holds _log_lock
+        rows, self._log_buffer = self._log_buffer, []
+        if self._log_timer is not None:
+            self._log_timer.cancel()
+            self._log_timer = None
+        return rows
+
+    def _write_chat_logs(self, rows: List[Dict[str, Any]]) -> None:
+        # One transaction, one prepared INSERT executed for all rows;
+        # timestamp comes from the column's utc_now default
         try:
-            with self.get_session() as session:
-                log_entry = SQLChatLog(
-                    user_message=user_message,
-                    assistant_response=assistant_response,
-                    data_source=data_source
-                )
-                session.add(log_entry)
-                
+            with self.engine.begin() as connection:
+                connection.execute(insert(SQLChatLog), rows)
         except Exception as e:
             logger.error(f"Error logging chat: {e}")
 
     def get_database_stats(self) -> Dict[str, int]:
+        # Buffered chat logs are written first on every call, cache hit or not
+        self.flush_chat_logs()
         try:
-            with self.get_session() as session:
-                stats = {
-                    "users": session.query(SQLUser).count(),
-                    "chat_sessions": session.query(SQLChatSession).count(),
-                    "chat_messages": session.query(SQLChatMessage).count(),
-                    "chat_logs": session.query(SQLChatLog).count(),
-                }
-                return stats
-                
+            return dict(self._count_tables())
         except Exception as e:
             logger.error(f"Error getting stats: {e}")
             return {}
 
+    @cached(_db_stats_cache, key=partial(hashkey, "database_stats"), lock=_db_stats_cache_lock)
+    def _count_tables(self) -> Dict[str, int]:
+        # Errors propagate, so a failed count is never cached
+        with self.get_session() as session:
+            # All four counts in one statement, each a plain COUNT(*)
+            # rather than a count over a full-entity subquery
+            counts = {
+                name: select(func.count()).select_from(model).scalar_subquery().label(name)
+                for name, model in (
+                    ("users", SQLUser),
+                    ("chat_sessions", SQLChatSession),
+                    ("chat_messages", SQLChatMessage),
+                    ("chat_logs", SQLChatLog),
+                )
+            }
+            row = session.execute(select(*counts.values())).one()
+            return dict(row._mapping)
+
     # ---------------------------
     # Helpers
     # ---------------------------
@@ -514,72 +895,126 @@ class DatabaseManager:
     def _sqlalchemy_message_to_pydantic(self, db_message: SQLChatMessage) -> PydanticMessage:
         """Convert SQLAlchemy message to Pydantic using automatic validation."""
         return PydanticMessage.model_validate(db_message)
+
+    def _message_row_to_pydantic(self, row: Any, metadata: Dict[str, Any]) -> PydanticMessage:
+        """Message from a projected column row, without re-validation."""
+        return PydanticMessage.model_construct(
+            id=row.id,
+            chat_id=row.chat_id,
+            role=row.role,
+            content=row.content,
+            metadata=metadata,
+            created_at=row.created_at
+        )
     
 
-    def _sqlalchemy_session_to_pydantic_with_loaded_messages(
-        self, 
-        db_session: SQLChatSession
+    def _session_summary_to_pydantic(
+        self,
+        db_session: Any,
+        message_count: int,
+        last_message: Optional[str]
     ) -> PydanticChatSession:
-        messages = db_session.messages if db_session.messages else []
-        message_count = len(messages)
-        
-        last_message = None
-        if messages:
-            last_msg = max(messages, key=lambda m: m.created_at)
-            last_message = last_msg.content[:100]
-            if len(last_msg.content) > 100:
-                last_message += "..."
-        
-        return PydanticChatSession(
+        # db_session is a ChatSession entity or a row of _CHAT_SUMMARY_COLUMNS.
+        # Rows come straight from the DB, so skip per-field validation on
+        # the list path.
+        return PydanticChatSession.model_construct(
             id=db_session.id,
             user_id=db_session.user_id,
             title=db_session.title,
             created_at=db_session.created_at,
             updated_at=db_session.updated_at,
-            is_archived=db_session.is_archived,
-            is_pinned=db_session.is_pinned,
-            is_incognito=db_session.is_incognito,
-            message_count=message_count,
+            is_archived=bool(db_session.is_archived),
+            is_pinned=bool(db_session.is_pinned),
+            is_incognito=bool(db_session.is_incognito),
+            message_count=message_count or 0,
             last_message=last_message
         )
     
     def chat_belongs_to_user(self, chat_id: int, user_id: int) -> bool:
         try:
             with self.get_session() as session:
-                exists = session.query(SQLChatSession).filter_by(
-                    id=chat_id,
-                    user_id=user_id
-                ).first() is not None
+                # Constant projection on a PK lookup: answered from the rowid
+                # b-tree without hydrating a ChatSession entity.
+                exists = session.scalar(
+                    select(literal(1)).where(
+                        SQLChatSession.id == chat_id,
+                        SQLChatSession.user_id == user_id,
+                    )
+                ) is not None
                 return exists
         except Exception as e:
             logger.error(f"Error checking chat ownership: {e}")
             return False
     
+    def get_chat_history(
+        self,
+        chat_id: int,
+        user_id: int,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Optional[Tuple[PydanticChatSession, List[PydanticMessage]]]:
+        """
+        Ownership check, message page and chat summary in one transaction.
+        Returns None when the chat does not exist or belongs to someone else.
+        """
+        try:
+            with self.session_scope():
+                if not self.chat_belongs_to_user(chat_id, user_id):
+                    return None
+                messages = self.get_chat_messages(chat_id, limit, offset)
+                chat = self.get_chat_session_by_id(chat_id, user_id)
+                return (chat, messages) if chat else None
+        except Exception as e:
+            logger.error(f"Error getting chat history {chat_id}: {e}")
+            return None
+
+    def _mark_user_stats_stale(self, session: Session, user_id: Optional[int]) -> None:
+        """Drop user_id's cached statistics once session's transaction commits."""
+        if user_id is not None:
+            session.info.setdefault("stale_user_stats", set()).add(user_id)
+
+    def _drop_stale_user_stats(self, session: Session) -> None:
+        stale = session.info.pop("stale_user_stats", None)
+        if stale:
+            with self._user_stats_cache_lock:
+                self._user_stats_generation += 1
+                for user_id in stale:
+                    self._user_stats_cache.pop(user_id, None)
+
+    def _forget_stale_user_stats(self, session: Session) -> None:
+        session.info.pop("stale_user_stats", None)
+
     def get_user_statistics(self, user_id: int) -> Dict[str, Any]:
+        with self._user_stats_cache_lock:
+            cached_stats = self._user_stats_cache.get(user_id)
+            generation = self._user_stats_generation
+        if cached_stats is not None:
+            return dict(cached_stats)
         try:
             with self.get_session() as session:
-                stats = session.query(
-                    func.count(func.distinct(SQLChatSession.id)).label('total_chats'),
-                    func.count(SQLChatMessage.id).label('total_messages'),
-                    func.sum(case(
-                        (SQLChatSession.is_archived == True, 1),
-                        else_=0
-                    )).label('archived_chats'),
-                    func.sum(case(
-                        (SQLChatSession.is_pinned == True, 1),
-                        else_=0
-                    )).label('pinned_chats')
-                ).select_from(SQLChatSession).outerjoin(
-                    SQLChatMessage,
-                    SQLChatMessage.chat_id == SQLChatSession.id
-                ).filter(
-                    SQLChatSession.user_id == user_id
-                ).first()
+                # Chat flags are summed over the user's chats alone; joining
+                # messages in repeated every chat once per message, which
+                # also over-counted archived and pinned chats
+                message_count = (
+                    select(func.count())
+                    .select_from(SQLChatMessage)
+                    .join(SQLChatSession, SQLChatMessage.chat_id == SQLChatSession.id)
+                    .where(SQLChatSession.user_id == user_id)
+                    .scalar_subquery()
+                )
+                stats = session.execute(
+                    select(
+                        func.count().label('total_chats'),
+                        message_count.label('total_messages'),
+                        func.sum(case((SQLChatSession.is_archived == True, 1), else_=0)).label('archived_chats'),
+                        func.sum(case((SQLChatSession.is_pinned == True, 1), else_=0)).label('pinned_chats'),
+                    ).where(SQLChatSession.user_id == user_id)
+                ).one()
                 
                 total_chats = stats.total_chats or 0
                 total_messages = stats.total_messages or 0
                 
-                return {
+                result = {
                     'total_chats': total_chats,
                     'total_messages': total_messages,
                     'archived_chats': stats.archived_chats or 0,
@@ -588,6 +1023,16 @@ class DatabaseManager:
                         total_messages / total_chats if total_chats > 0 else 0
                     )
                 }
+                # Counts that include this session's own uncommitted writes
+                # are not cached
+                uncommitted = bool(session.info.get("stale_user_stats"))
+            # Only successful results are cached, and only if no write
+            # committed since the read started
+            if not uncommitted:
+                with self._user_stats_cache_lock:
+                    if self._user_stats_generation == generation:
+                        self._user_stats_cache[user_id] = result
+            return dict(result)
         except Exception as e:
             logger.error(f"Error getting user statistics: {e}")
             return {
@@ -605,19 +1050,25 @@ class DatabaseManager:
 
         try:
             with self.get_session() as session:
-                query = session.query(SQLChatSession).filter_by(id=chat_id)
+                # Count and preview come from the same correlated subqueries
+                # as the chat list, instead of loading every message
+                stmt = select(
+                    *_CHAT_SUMMARY_COLUMNS,
+                    _CHAT_MESSAGE_COUNT.label("message_count"),
+                    _CHAT_LAST_MESSAGE.label("last_message"),
+                ).where(SQLChatSession.id == chat_id)
                 
                 if user_id is not None:
-                    query = query.filter_by(user_id=user_id)
-
-                query = query.options(joinedload(SQLChatSession.messages))    
+                    stmt = stmt.where(SQLChatSession.user_id == user_id)
                 
-                db_session = query.first()
+                row = session.execute(stmt).first()
                 
-                if not db_session:
+                if not row:
                     return None
                 
-                return self._sqlalchemy_session_to_pydantic_with_loaded_messages(db_session)
+                return self._session_summary_to_pydantic(
+                    row, row.message_count, _message_preview(row.last_message)
+                )
                 
         except Exception as e:
             logger.error(f"Error getting chat session {chat_id}: {e}")
@@ -625,8 +1076,23 @@ class DatabaseManager:
 
 
 
-db_manager = DatabaseManager()
+@lru_cache(maxsize=1)
+def get_db_manager() -> DatabaseManager:
+    """
+    Create the DatabaseManager on first use and reuse it afterwards.
+    Importing this module no longer opens the engine or runs migrations.
+    """
+    return DatabaseManager()
+
+
+def __getattr__(name: str) -> Any:
+    # `from app.database.database import db_manager` keeps working, lazily
+    if name == "db_manager":
+        return get_db_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def init_db():
     """Initialize database."""
-    logger.info("Database initialized via DatabaseManager")
\ No newline at end of file
+    get_db_manager()
+    logger.info("Database initialized via DatabaseManager")
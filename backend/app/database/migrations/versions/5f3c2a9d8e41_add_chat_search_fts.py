@@ -0,0 +1,55 @@
+"""Add FTS5 search tables for chat titles and messages
+
+Revision ID: 5f3c2a9d8e41
+Revises: 294499487a0a
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f3c2a9d8e41'
+down_revision = '294499487a0a'
+branch_labels = None
+depends_on = None
+
+# External-content FTS5 tables (no second copy of the text) kept in sync by
+# triggers. The trigram tokenizer makes `LIKE '%query%'` on them an index
+# lookup with the same substring, case-insensitive semantics as before.
+FTS_TABLES = (
+    # (fts table, source table, indexed column)
+    ('chat_messages_fts', 'chat_messages', 'content'),
+    ('chat_sessions_fts', 'chat_sessions', 'title'),
+)
+
+
+def upgrade() -> None:
+    for fts, source, column in FTS_TABLES:
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5("
+            f"{column}, content='{source}', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {source} BEGIN "
+            f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {source} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {column} ON {source} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column}); "
+            f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END"
+        )
+        # Index the rows that already exist
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    for fts, _source, _column in FTS_TABLES:
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        op.execute(f"DROP TABLE IF EXISTS {fts}")
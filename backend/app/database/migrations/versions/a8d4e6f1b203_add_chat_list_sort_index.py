@@ -0,0 +1,30 @@
+"""Add chat list sort index
+
+Revision ID: a8d4e6f1b203
+Revises: 5f3c2a9d8e41
+Create Date: 2026-10-15 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8d4e6f1b203'
+down_revision = '5f3c2a9d8e41'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Matches get_user_chat_sessions: filter on user_id/is_archived, order by
+    # is_pinned DESC, updated_at DESC, so a page is read straight off the index
+    op.create_index(
+        'ix_chat_sessions_user_archived_pinned_updated',
+        'chat_sessions',
+        ['user_id', 'is_archived', sa.text('is_pinned DESC'), sa.text('updated_at DESC')],
+        unique=False,
+    )
+    # ix_chat_messages_chat_created (chat_id, created_at) already exists
+
+def downgrade() -> None:
+    op.drop_index('ix_chat_sessions_user_archived_pinned_updated', table_name='chat_sessions')
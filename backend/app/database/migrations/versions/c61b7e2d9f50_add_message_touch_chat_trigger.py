@@ -0,0 +1,29 @@
+"""Add trigger bumping chat updated_at on new messages
+
+Revision ID: c61b7e2d9f50
+Revises: a8d4e6f1b203
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c61b7e2d9f50'
+down_revision = 'a8d4e6f1b203'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # UTC timestamp in the same 'YYYY-MM-DD HH:MM:SS.ffffff' layout SQLAlchemy
+    # writes, so ordering by updated_at stays consistent
+    op.execute(
+        "CREATE TRIGGER msg_touch_chat AFTER INSERT ON chat_messages BEGIN "
+        "UPDATE chat_sessions "
+        "SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') || '000' "
+        "WHERE id = NEW.chat_id; END"
+    )
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS msg_touch_chat")
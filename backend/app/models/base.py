@@ -1,6 +1,13 @@
 """
 SQLAlchemy Base model.
 """
+from sqlalchemy import DateTime, literal_column
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
+
+# Current UTC time computed by SQLite, in the same 'YYYY-MM-DD HH:MM:SS.ffffff'
+# layout SQLAlchemy writes for DateTime values (and the msg_touch_chat trigger
+# uses), so stored timestamps keep sorting consistently. Used as column
+# default/onupdate, it is rendered inline instead of bound from Python.
+utc_now = literal_column("(strftime('%Y-%m-%d %H:%M:%f', 'now') || '000')", DateTime)
@@ -6,9 +6,7 @@ from sqlalchemy import (
     DateTime, ForeignKey, Index
 )
 from sqlalchemy.orm import relationship
-from datetime import datetime
-
-from app.models.base import Base
+from app.models.base import Base, utc_now
 
 
 class ChatSession(Base):
@@ -18,24 +16,32 @@ class ChatSession(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     title = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=utc_now)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
     is_archived = Column(Boolean, default=False)
     is_pinned = Column(Boolean, default=False)
     is_incognito = Column(Boolean, default=False)
 
-    user = relationship("User", back_populates="chat_sessions")
+    user = relationship("User", back_populates="chat_sessions", lazy="raise")
     messages = relationship(
         "ChatMessage",
         back_populates="chat",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy="raise"
     )
 
     __table_args__ = (
         Index('ix_chat_sessions_user_updated', 'user_id', 'updated_at'),
         Index('ix_chat_sessions_user_archived', 'user_id', 'is_archived'),
         Index('ix_chat_sessions_user_pinned', 'user_id', 'is_pinned'),
+        Index(
+            'ix_chat_sessions_user_archived_pinned_updated',
+            user_id, is_archived, is_pinned.desc(), updated_at.desc()
+        ),
     )
+    # SQL-side created_at/updated_at come back via RETURNING on the same
+    # INSERT/UPDATE instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     def __repr__(self):
         return f"<ChatSession(id={self.id}, user_id={self.user_id})>"
@@ -49,9 +55,9 @@ class ChatMessage(Base):
     role = Column(String(50), nullable=False)  # 'user' or 'assistant'
     content = Column(Text, nullable=False)
     message_metadata = Column(Text, nullable=True)  # JSON string
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=utc_now)
 
-    chat = relationship("ChatSession", back_populates="messages")
+    chat = relationship("ChatSession", back_populates="messages", lazy="raise")
 
     __table_args__ = (
         Index('ix_chat_messages_chat_id', 'chat_id'),
@@ -71,7 +77,7 @@ class ChatLog(Base):
     user_message = Column(Text, nullable=False)
     assistant_response = Column(Text, nullable=False)
     data_source = Column(String(100), nullable=True)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, default=utc_now)
 
     __table_args__ = (
         Index('ix_chat_logs_timestamp', 'timestamp'),
@@ -3,9 +3,7 @@ from sqlalchemy import (
     DateTime, UniqueConstraint, Index
 )
 from sqlalchemy.orm import relationship
-from datetime import datetime
-
-from app.models.base import Base
+from app.models.base import Base, utc_now
 
 class User(Base):
     """User model for OAuth authentication."""
@@ -19,13 +17,14 @@ class User(Base):
     oauth_id = Column(String(255), nullable=False)
     provider_data = Column(Text, nullable=True)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=utc_now)
     last_login = Column(DateTime, nullable=True)
 
     chat_sessions = relationship(
         "ChatSession",
         back_populates="user",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy="raise"
     )
 
     __table_args__ = (
@@ -1,6 +1,7 @@
 """
 Pydantic schemas for Chat models - API validation and serialization.
 """
+import orjson
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime
@@ -76,10 +77,9 @@ class MessageBase(BaseModel):
         if v is None:
             return {}
         if isinstance(v, str):
-            import json
             try:
-                return json.loads(v)
-            except json.JSONDecodeError:
+                return orjson.loads(v)
+            except orjson.JSONDecodeError:
                 return {}
         return v
 
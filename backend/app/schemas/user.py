@@ -46,7 +46,7 @@ class User(UserInDB):
 class TokenData(BaseModel):
     """Schema for JWT token payload data."""
     sub: str  # User ID
-    exp: datetime  # Expiration time
+    exp: int  # Expiration time (unix timestamp)
     name: str
     email: str
     is_active: bool = True
@@ -1,7 +1,7 @@
 from typing import Optional
 import logging
 from datetime import datetime
-from app.database.database import db_manager
+from app.database.database import DatabaseManager, get_db_manager
 from app.utils.async_utils import run_sync
 from app.schemas.user import User, UserCreate
  
@@ -13,8 +13,9 @@ class AuthService:
     Authentication and user management service.
     """
     
-    def __init__(self):
-        self.db = db_manager
+    @property
+    def db(self) -> DatabaseManager:
+        return get_db_manager()
     
     async def get_user_by_id(self, user_id: int) -> Optional[User]:
         try:
@@ -1,15 +1,27 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime
-from app.database.database import db_manager
+from app.database.database import DatabaseManager, get_db_manager
 from app.schemas.chat import ChatSession, ChatMessage
-from app.data_manager import DataManager
+from app.data_manager import data_manager
 from app.chat_utils import build_context_from_results
 from app.services.openai_service import openai_service
 from app.utils.async_utils import run_sync
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class PipelineResult:
+    """Outcome of one user message → assistant reply round trip."""
+    response: str
+    chat_id: int
+    message_id: Optional[int]
+    user_message_id: Optional[int]
+    is_incognito: bool
+    sources: List[Dict[str, Any]] = field(default_factory=list)
+
+
 class ChatService:
     """
     ChatService using SQLAlchemy ORM + chat management.
@@ -18,14 +30,18 @@ class ChatService:
     """
 
     def __init__(self):
-        self.db = db_manager
-        self.data_manager = DataManager()
+        self.data_manager = data_manager
 
         # --- in-memory storage for incognito ---
         self._incognito_chats: Dict[int, Dict[str, Any]] = {}
         self._incognito_messages: Dict[int, List[Dict[str, Any]]] = {}
         self._incognito_id = -1
 
+    @property
+    def db(self) -> DatabaseManager:
+        # Created on first use, not when this module is imported
+        return get_db_manager()
+
     # ========== helpers (incognito id / checks) ==========
     def _new_incognito_id(self) -> int:
         cid = self._incognito_id
@@ -288,6 +304,7 @@ class ChatService:
         chat_id: int,
         limit: Optional[int] = None,
         offset: int = 0,
+        include_metadata: bool = True,
     ) -> List[ChatMessage]:
         try:
             if self._is_incognito_chat_id(chat_id):
@@ -308,11 +325,43 @@ class ChatService:
                     for m in msgs
                 ]
             else:
-                return await run_sync(self.db.get_chat_messages,chat_id, limit or 100, offset)
+                return await run_sync(self.db.get_chat_messages,chat_id, limit or 100, offset, include_metadata)
         except Exception as e:
             logger.error(f"Error getting messages for chat {chat_id}: {e}")
             return []
 
+    async def get_chat_history(
+        self,
+        chat_id: int,
+        user_id: int,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Optional[Tuple[ChatSession, List[ChatMessage]]]:
+        """Chat summary plus a page of messages, or None if not the user's chat."""
+        if self._is_incognito_chat_id(chat_id):
+            if not await self.verify_chat_owner(chat_id, user_id):
+                return None
+            messages = await self.get_chat_messages(chat_id, limit=limit, offset=offset)
+            chat = await self.get_chat_session(chat_id, user_id)
+            return (chat, messages) if chat else None
+        # Persisted: one executor hop and one transaction for all three reads
+        return await run_sync(self.db.get_chat_history, chat_id, user_id, limit or 100, offset)
+
+    def iter_chat_messages(self, chat_id: int) -> Iterator[ChatMessage]:
+        """Sync generator over all chat messages, used for streaming responses."""
+        if self._is_incognito_chat_id(chat_id):
+            for m in list(self._incognito_messages.get(chat_id, [])):
+                yield ChatMessage(
+                    id=m["id"],
+                    chat_id=m["chat_id"],
+                    role=m["role"],
+                    content=m["content"],
+                    metadata=m.get("metadata") or {},
+                    created_at=m["created_at"],
+                )
+        else:
+            yield from self.db.iter_chat_messages(chat_id)
+
     # ========== AI pipeline ==========
     async def process_user_message(
         self,
@@ -320,7 +369,7 @@ class ChatService:
         user_message: str,
         data_source: str = "company_faqs",
         context_metadata: Optional[Dict[str, Any]] = None,
-    ) -> Optional[ChatMessage]:
+    ) -> Optional[PipelineResult]:
         try:
             user_msg_metadata = {
                 "data_source": data_source,
@@ -357,7 +406,17 @@ class ChatService:
             ai_msg = await self.add_message(
                 chat_id=chat_id, role="assistant", content=ai_response, metadata=ai_msg_metadata
             )
-            return ai_msg
+            if not ai_msg:
+                return None
+
+            return PipelineResult(
+                response=ai_msg.content,
+                chat_id=chat_id,
+                message_id=ai_msg.id,
+                user_message_id=user_msg.id,
+                is_incognito=self._is_incognito_chat_id(chat_id),
+                sources=self._format_sources(relevant_data),
+            )
 
         except Exception as e:
             logger.error(f"Error processing user message for chat {chat_id}: {e}")
@@ -368,42 +427,31 @@ class ChatService:
         chat_id: int,
         user_message: str,
         data_source: str = "company_faqs",
-    ) -> Dict[str, Any]:
-        try:
-            ai_message = await self.process_user_message(
-                chat_id=chat_id, user_message=user_message, data_source=data_source
+    ) -> PipelineResult:
+        result = await self.process_user_message(
+            chat_id=chat_id, user_message=user_message, data_source=data_source
+        )
+        if result is None:
+            return PipelineResult(
+                response="Error occurred while processing your request.",
+                chat_id=chat_id,
+                message_id=None,
+                user_message_id=None,
+                is_incognito=self._is_incognito_chat_id(chat_id),
             )
-            if not ai_message:
-                return {"response": "Error occurred while processing your request.", 
-                        "sources": [], 
-                        "message_id": None,
-                        "chat_id": chat_id
-                        }
-
-            relevant_data = await run_sync(self._search_relevant_data,user_message, data_source)
-            sources = [
-                {
-                    "title": data.get("title", f"Source {i+1}"),
-                    "content": data.get("content", "")[:200]
-                    + ("..." if len(data.get("content", "")) > 200 else ""),
-                    "metadata": data.get("metadata", {}),
-                }
-                for i, data in enumerate(relevant_data)
-            ]
+        return result
 
-            return {
-                "response": ai_message.content,
-                "sources": sources,
-                "message_id": ai_message.id,
-                "chat_id": chat_id,
-            }
-        except Exception as e:
-            logger.error(f"Error getting response with sources: {e}")
-            return {"response": "Error occurred while processing your request.", 
-                    "sources": [], 
-                    "message_id": None,
-                    "chat_id": chat_id
+    @staticmethod
+    def _format_sources(relevant_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "title": data.get("title", f"Source {i+1}"),
+                "content": data.get("content", "")[:200]
+                + ("..." if len(data.get("content", "")) > 200 else ""),
+                "metadata": data.get("metadata", {}),
             }
+            for i, data in enumerate(relevant_data)
+        ]
 
     # ========== context & search utils ==========
     def _search_relevant_data(self, message: str, data_source: str) -> List[Dict[str, Any]]:
@@ -425,7 +473,7 @@ class ChatService:
 
     async def get_chat_context(self, chat_id: int, max_messages: int = 10) -> str:
         try:
-            messages = await self.get_chat_messages(chat_id, limit=max_messages)
+            messages = await self.get_chat_messages(chat_id, limit=max_messages, include_metadata=False)
             parts = []
             for msg in messages[-max_messages:]:
                 role_prefix = "User" if msg.role == "user" else "Assistant"
@@ -438,7 +486,7 @@ class ChatService:
     # ========== analytics ==========
     async def get_chat_statistics(self, chat_id: int) -> Dict[str, Any]:
         try:
-            messages = await self.get_chat_messages(chat_id)
+            messages = await self.get_chat_messages(chat_id, include_metadata=False)
             user_messages = [m for m in messages if m.role == "user"]
             assistant_messages = [m for m in messages if m.role == "assistant"]
             return {
@@ -1,19 +1,36 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+from functools import partial
+import threading
 
-from app.data_manager import DataManager
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
+
+from app.data_manager import data_manager
 import logging
+
+# Read-mostly data source responses are served from memory for this long.
+DATA_CACHE_TTL = 300
+
+_data_cache: TTLCache = TTLCache(maxsize=64, ttl=DATA_CACHE_TTL)
+_data_cache_lock = threading.Lock()
+
+
 class DataService:
     """
     Service for working with data sources.
     Provides a convenient interface for working with FAQs and other data.
+    FAQ reads are cached for DATA_CACHE_TTL seconds, keyed by the FAQ load
+    generation so a reload is picked up at once; anything listing uploaded
+    files is not cached, since uploads can appear at any time.
     """
     
     def __init__(self):
-        self.data_manager = DataManager()
+        self.data_manager = data_manager
     
     def get_all_data_sources(self) -> Dict[str, Any]:
         """
         Get information about all available data sources.
+        Uploaded-file metadata is already cached per file mtime by DataManager.
         
         Returns:
             Dictionary with information about each source
@@ -22,7 +39,7 @@ class DataService:
     
     def get_categories(self) -> List[str]:
         """ Get all available FAQ categories."""
-        return self.data_manager.get_all_categories()
+        return list(self._categories(self.data_manager.faq_generation))
     
     def get_faqs_by_category(self, category: str) -> List[Dict[str, Any]]:
         """
@@ -34,7 +51,19 @@ class DataService:
         Returns:
             List of FAQ entries in the specified category
         """
-        return self.data_manager.get_faq_by_category(category)
+        # Fresh records per call, so callers may modify their results
+        return [
+            dict(record)
+            for record in self._faqs_by_category(self.data_manager.faq_generation, category)
+        ]
+
+    @cached(_data_cache, key=partial(hashkey, "categories"), lock=_data_cache_lock)
+    def _categories(self, generation: int) -> Tuple[str, ...]:
+        return tuple(self.data_manager.get_all_categories())
+
+    @cached(_data_cache, key=partial(hashkey, "faqs"), lock=_data_cache_lock)
+    def _faqs_by_category(self, generation: int, category: str) -> Tuple[Dict[str, Any], ...]:
+        return tuple(self.data_manager.get_faq_by_category(category))
     
     def search_faqs(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
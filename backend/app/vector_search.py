@@ -1,8 +1,10 @@
 import os
+import hashlib
 from venv import logger
 import numpy as np
 import faiss
 import pickle
+import threading
 import time
 from typing import List, Dict, Any, Tuple, Optional
 from pathlib import Path
@@ -31,6 +33,7 @@ class VectorSearchEngine:
         self.indexes = {}          # FAISS indexes {source_id: index}
         self.documents = {}        # Original documents {source_id: [docs]}
         self.last_updated = {}     # {source_id: timestamp}
+        self.text_hashes = {}      # Hash of each indexed text {source_id: [hash]}
     
     def _get_embedding(self, text: str) -> List[float]:
         """Get embedding for a text using OpenAI API."""
@@ -66,6 +69,17 @@ class VectorSearchEngine:
         index.add(embeddings_np)
         return index
     
+    def _previous_vectors(self, source_id: str) -> Dict[bytes, np.ndarray]:
+        """Vectors of the current index keyed by text hash (failed, all-zero ones excluded)."""
+        if source_id not in self.indexes and not self._load_index(source_id):
+            return {}
+        hashes = self.text_hashes.get(source_id)
+        index = self.indexes[source_id]
+        if not hashes or len(hashes) != index.ntotal:
+            return {}
+        vectors = index.reconstruct_n(0, index.ntotal)
+        return {h: v for h, v in zip(hashes, vectors) if v.any()}
+
     def build_index_from_dataframe(
         self, 
         df: pd.DataFrame, 
@@ -92,17 +106,22 @@ class VectorSearchEngine:
             doc["_document_id"] = len(documents)
             documents.append(doc)
         
-        # Step 2: Generate embeddings (batch mode)
-        print(f"Generating embeddings for {len(texts)} texts from {source_id}...")
+        # Step 2: Generate embeddings (batch mode); texts unchanged since the
+        # previous build of this source reuse their stored vectors
+        text_hashes = [hashlib.blake2b(text.encode(), digest_size=8).digest() for text in texts]
+        previous = self._previous_vectors(source_id)
+        embeddings = [previous.get(h) for h in text_hashes]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        print(f"Generating embeddings for {len(missing)} of {len(texts)} texts from {source_id}...")
         
         batch_size = 100  # Batch size for API
-        embeddings = []
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i+batch_size]
-            batch_embeddings = self._get_embeddings_batch(batch)
-            embeddings.extend(batch_embeddings)
-            print(f"Processed batch {i//batch_size + 1}/{(len(texts)-1)//batch_size + 1}")
+        for i in range(0, len(missing), batch_size):
+            batch = missing[i:i+batch_size]
+            batch_embeddings = self._get_embeddings_batch([texts[j] for j in batch])
+            for j, embedding in zip(batch, batch_embeddings):
+                embeddings[j] = embedding
+            print(f"Processed batch {i//batch_size + 1}/{(len(missing)-1)//batch_size + 1}")
         
         # Step 3: Create FAISS index
         print(f"Building FAISS index for {source_id}...")
@@ -112,6 +131,7 @@ class VectorSearchEngine:
         self.indexes[source_id] = index
         self.documents[source_id] = documents
         self.last_updated[source_id] = time.time()
+        self.text_hashes[source_id] = text_hashes
         
         # Step 5: Save to disk
         self._save_index(source_id)
@@ -120,13 +140,17 @@ class VectorSearchEngine:
     def build_index_for_company_faqs(self, csv_path: str) -> None:
         """Build index for company FAQ file."""
         try:
-            # Load CSV file
-            df = pd.read_csv(csv_path)
-            
-            # Determine delimiter if not standard comma
-            if len(df.columns) == 1:
-                # Try another delimiter
-                df = pd.read_csv(csv_path, sep=';')
+            # Determine delimiter from the header instead of parsing twice
+            with open(csv_path, "rb") as f:
+                header = f.readline()
+            sep = ";" if header.count(b";") > header.count(b",") else ","
+
+            # Load CSV file with the multithreaded pyarrow parser; the C engine
+            # handles anything it rejects (e.g. quoted multi-line values)
+            try:
+                df = pd.read_csv(csv_path, sep=sep, engine="pyarrow")
+            except (ImportError, ValueError):
+                df = pd.read_csv(csv_path, sep=sep)
             
             # Build index
             self.build_index_from_dataframe(
@@ -162,29 +186,66 @@ class VectorSearchEngine:
             distances, indices = self.indexes[source_id].search(query_vector, top_k)
             
             # Step 4: Format results
-            results = []
-            for i, doc_idx in enumerate(indices[0]):
-                if doc_idx < 0 or doc_idx >= len(self.documents[source_id]):
-                    continue  # Skip invalid indices
-                
-                # Get original document
-                doc = self.documents[source_id][doc_idx].copy()
-                
-                # Add similarity score (convert to range 0-1)
-                similarity = 1 / (1 + distances[0][i])
-                doc["_score"] = float(similarity)
-                
-                # Remove internal fields
-                doc.pop("_source_id", None)
-                doc.pop("_document_id", None)
-                
-                results.append(doc)
-            
-            return results
+            return self._format_results(source_id, distances[0], indices[0])
             
         except Exception as e:
             print(f"Error searching in {source_id}: {e}")
             return []
+
+    def search_batch(
+        self,
+        queries: List[str],
+        source_id: str,
+        top_k: int = 5
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Semantic search for several queries at once: one embeddings request
+        and one FAISS search over all query vectors.
+        """
+        try:
+            if source_id not in self.indexes:
+                if not self._load_index(source_id):
+                    print(f"No index found for {source_id}")
+                    return [[] for _ in queries]
+
+            query_vectors = np.array(self._get_embeddings_batch(queries)).astype('float32')
+            distances, indices = self.indexes[source_id].search(query_vectors, top_k)
+
+            return [
+                self._format_results(source_id, distances[row], indices[row])
+                for row in range(len(queries))
+            ]
+
+        except Exception as e:
+            print(f"Error batch searching in {source_id}: {e}")
+            return [[] for _ in queries]
+
+    def _format_results(
+        self,
+        source_id: str,
+        distances: np.ndarray,
+        indices: np.ndarray
+    ) -> List[Dict[str, Any]]:
+        """Turn one row of FAISS output into scored documents."""
+        results = []
+        for i, doc_idx in enumerate(indices):
+            if doc_idx < 0 or doc_idx >= len(self.documents[source_id]):
+                continue  # Skip invalid indices
+            
+            # Get original document
+            doc = self.documents[source_id][doc_idx].copy()
+            
+            # Add similarity score (convert to range 0-1)
+            similarity = 1 / (1 + distances[i])
+            doc["_score"] = float(similarity)
+            
+            # Remove internal fields
+            doc.pop("_source_id", None)
+            doc.pop("_document_id", None)
+            
+            results.append(doc)
+        
+        return results
     
     def _save_index(self, source_id: str) -> bool:
         """Save index to disk."""
@@ -204,7 +265,8 @@ class VectorSearchEngine:
             with open(data_path, 'wb') as f:
                 pickle.dump({
                     'documents': self.documents[source_id],
-                    'last_updated': self.last_updated.get(source_id, time.time())
+                    'last_updated': self.last_updated.get(source_id, time.time()),
+                    'text_hashes': self.text_hashes.get(source_id)
                 }, f)
             
             return True
@@ -231,6 +293,7 @@ class VectorSearchEngine:
                 data = pickle.load(f)
                 self.documents[source_id] = data['documents']
                 self.last_updated[source_id] = data.get('last_updated', time.time())
+                self.text_hashes[source_id] = data.get('text_hashes')
             
             print(f"Loaded index {source_id} with {len(self.documents[source_id])} documents.")
             return True
@@ -274,4 +337,88 @@ class VectorSearchEngine:
         
         return indexes
 
+class _PendingSearch:
+    """One caller's query waiting in a SearchBatcher."""
+    __slots__ = ("query", "top_k", "done", "batch", "result", "error")
+
+    def __init__(self, query: str, top_k: int):
+        self.query = query
+        self.top_k = top_k
+        self.done = threading.Event()
+        # Set (with `done`) when this caller is handed a queued batch to run
+        self.batch: Optional[List["_PendingSearch"]] = None
+        self.result: List[Dict[str, Any]] = []
+        self.error: Optional[BaseException] = None
+
+
+class SearchBatcher:
+    """
+    Coalesces concurrent searches on one source into shared search_batch calls.
+
+    Searches run in worker threads. While fewer than `max_in_flight` batches
+    are running, a caller searches straight away on its own. Beyond that,
+    callers queue; whichever batch finishes first hands everything queued to
+    one of the waiting callers, which runs it as the next batch. Batching thus
+    only kicks in under real concurrency, nobody waits on a timer, and the
+    number of simultaneous embedding requests stays bounded.
+    """
+
+    def __init__(self, engine: VectorSearchEngine, source_id: str, max_in_flight: int = 4):
+        self.engine = engine
+        self.source_id = source_id
+        self.max_in_flight = max_in_flight
+        self._lock = threading.Lock()
+        self._pending: List[_PendingSearch] = []
+        self._in_flight = 0
+
+    def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        entry = _PendingSearch(query, top_k)
+        with self._lock:
+            if self._in_flight < self.max_in_flight:
+                self._in_flight += 1
+                batch = [entry]
+            else:
+                self._pending.append(entry)
+                batch = None
+
+        while True:
+            if batch is not None:
+                self._lead(batch)
+            entry.done.wait()
+            if entry.batch is None:
+                break
+            # Handed a queued batch (which includes this caller) to run
+            batch, entry.batch = entry.batch, None
+            entry.done.clear()
+
+        if entry.error is not None:
+            raise entry.error
+        return entry.result
+
+    def _lead(self, batch: List[_PendingSearch]) -> None:
+        self._run(batch)
+        with self._lock:
+            if not self._pending:
+                self._in_flight -= 1
+                return
+            queued, self._pending = self._pending, []
+        successor = queued[0]
+        successor.batch = queued
+        successor.done.set()
+
+    def _run(self, batch: List[_PendingSearch]) -> None:
+        try:
+            max_k = max(entry.top_k for entry in batch)
+            results = self.engine.search_batch(
+                [entry.query for entry in batch], self.source_id, top_k=max_k
+            )
+            for entry, found in zip(batch, results):
+                entry.result = found[:entry.top_k]
+        except Exception as e:
+            for entry in batch:
+                entry.error = e
+        for entry in batch:
+            entry.done.set()
+
+
 vector_search = VectorSearchEngine()
\ No newline at end of file
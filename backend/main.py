@@ -5,19 +5,18 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
-from app.data_manager import DataManager
+from app.data_manager import data_manager
 from app.database.database import init_db
 from app.middleware.auth_middleware import AuthMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.auth.oauth import OAuthProvider
 from app.utils.async_utils import shutdown_executor
 
 load_dotenv()
 
 logger = logging.getLogger("uvicorn.error") 
 
-data_manager = DataManager()
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -43,6 +42,8 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    await OAuthProvider.aclose_client()
+
     logger.info("Shutting down executor...")
     shutdown_executor()
     logger.info("Shutdown complete")
@@ -0,0 +1,67 @@
+"""
+Shared fixtures. Settings are read at import time, so the environment is
+filled in before any app module is imported.
+"""
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+# Nothing listens here: embedding calls fail fast instead of reaching OpenAI
+os.environ.setdefault("OPENAI_BASE_URL", "http://127.0.0.1:9/v1")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+# Importing app.data_manager builds its module-level DataManager, which
+# rebuilds (and rewrites) the FAQ index whenever the CSV is newer than it; a
+# copy dated at the epoch keeps the tracked index files untouched
+_faqs_dir = tempfile.mkdtemp()
+atexit.register(shutil.rmtree, _faqs_dir, ignore_errors=True)
+_faqs_copy = Path(_faqs_dir) / "company_faqs.csv"
+shutil.copy(BACKEND_DIR / "data" / "company_faqs.csv", _faqs_copy)
+os.utime(_faqs_copy, (0, 0))
+os.environ.setdefault("COMPANY_FAQS_PATH", str(_faqs_copy))
+
+
+@pytest.fixture
+def db_manager(tmp_path, monkeypatch):
+    """A DatabaseManager on a fresh, fully migrated SQLite file."""
+    from alembic import command
+    from sqlalchemy import create_engine, text
+
+    from app.database import migration_manager
+    from app.database.database import DatabaseManager
+    from app.models import Base
+
+    db_path = tmp_path / "test.db"
+    db_url = f"sqlite:///{db_path}"
+
+    # The first revision only adds indexes to tables that pre-date the
+    # migrations, so a fresh file starts from the model schema at that
+    # revision; DatabaseManager then upgrades it to head (FTS, trigger, ...)
+    engine = create_engine(db_url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_chat_sessions_user_archived_pinned_updated"))
+    engine.dispose()
+
+    # alembic.ini locates the migration scripts relative to the cwd, and the
+    # global migration manager would otherwise keep the first database's URL
+    monkeypatch.chdir(BACKEND_DIR)
+    migrations = migration_manager.MigrationManager(db_url)
+    command.stamp(migrations.alembic_cfg, "294499487a0a")
+    monkeypatch.setattr(migration_manager, "migration_manager", migrations)
+
+    manager = DatabaseManager(str(db_path))
+    yield manager
+    manager.flush_chat_logs()
+    manager.flush_last_logins()
+    manager.engine.dispose()
+    migrations.engine.dispose()
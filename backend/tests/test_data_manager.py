@@ -0,0 +1,63 @@
+import threading
+from unittest import mock
+
+import pytest
+from cachetools import TTLCache
+
+from app.data_manager import DataManager
+
+
+class _RecordingBatcher:
+    def __init__(self, results):
+        self.results = results
+        self.queries = []
+
+    def search(self, query, top_k):
+        self.queries.append((query, top_k))
+        return [dict(record) for record in self.results]
+
+
+@pytest.fixture
+def manager():
+    # Only the state search_faqs touches; no CSV load or index build
+    dm = DataManager.__new__(DataManager)
+    dm._faq_search_cache = TTLCache(maxsize=16, ttl=60)
+    dm._faq_search_cache_lock = threading.Lock()
+    dm._faq_batcher = _RecordingBatcher([{"question": "How do I reset my password?", "score": 0.9}])
+    with mock.patch.object(DataManager, "_ensure_faq_index"):
+        yield dm
+
+
+def test_search_faqs_shares_normalized_key(manager):
+    first = manager.search_faqs("  Reset Password ", limit=3)
+    second = manager.search_faqs("reset password", limit=3)
+
+    assert first == second
+    # The search sees the query as typed; only the cache key is normalized
+    assert manager._faq_batcher.queries == [("  Reset Password ", 3)]
+
+
+def test_search_faqs_keys_on_limit(manager):
+    manager.search_faqs("reset password", limit=3)
+    manager.search_faqs("reset password", limit=5)
+    assert manager._faq_batcher.queries == [("reset password", 3), ("reset password", 5)]
+
+
+def test_search_faqs_returns_copies(manager):
+    first = manager.search_faqs("reset password")
+    first[0]["score"] = 0.0
+    first.append({"question": "injected"})
+
+    second = manager.search_faqs("reset password")
+    assert second == [{"question": "How do I reset my password?", "score": 0.9}]
+    second[0]["score"] = 0.1
+    assert manager.search_faqs("reset password")[0]["score"] == 0.9
+
+
+def test_search_faqs_does_not_cache_failures(manager):
+    manager._faq_batcher.search = mock.Mock(side_effect=RuntimeError("offline"))
+    with mock.patch.object(DataManager, "_fallback_text_search", return_value=[]) as fallback:
+        assert manager.search_faqs("reset password") == []
+        assert manager.search_faqs("reset password") == []
+    assert fallback.call_count == 2
+    assert len(manager._faq_search_cache) == 0
@@ -0,0 +1,58 @@
+from app.services.data_service import DataService
+
+
+class _FakeDataManager:
+    def __init__(self):
+        self.faq_generation = 1
+        self.categories = ["Billing"]
+        self.calls = 0
+
+    def get_all_categories(self):
+        self.calls += 1
+        return list(self.categories)
+
+    def get_faq_by_category(self, category):
+        self.calls += 1
+        return [{"Category": category, "Question": "How do I pay?"}]
+
+
+def _service():
+    service = DataService()
+    service.data_manager = _FakeDataManager()
+    return service
+
+
+def test_categories_cached_until_faqs_reload():
+    service = _service()
+    assert service.get_categories() == ["Billing"]
+    assert service.get_categories() == ["Billing"]
+    assert service.data_manager.calls == 1
+
+    # A reload bumps the generation; the next read sees the new data
+    service.data_manager.categories = ["Billing", "Shipping"]
+    service.data_manager.faq_generation += 1
+    assert service.get_categories() == ["Billing", "Shipping"]
+    assert service.data_manager.calls == 2
+
+
+def test_cached_reads_return_copies():
+    service = _service()
+    categories = service.get_categories()
+    categories.append("Injected")
+    assert service.get_categories() == ["Billing"]
+
+    faqs = service.get_faqs_by_category("Billing")
+    faqs[0]["Question"] = "changed"
+    faqs.append({})
+    assert service.get_faqs_by_category("Billing") == [
+        {"Category": "Billing", "Question": "How do I pay?"}
+    ]
+    assert service.data_manager.calls == 2
+
+
+def test_faq_load_bumps_generation():
+    from app.data_manager import data_manager
+
+    generation = data_manager.faq_generation
+    data_manager.load_company_faqs()
+    assert data_manager.faq_generation == generation + 1
@@ -0,0 +1,176 @@
+from sqlalchemy import text
+
+from app.schemas.user import UserCreate
+
+
+def _user(oauth_id="1", email="ada@example.com", name="Ada"):
+    return UserCreate(
+        email=email,
+        name=name,
+        oauth_provider="github",
+        oauth_id=oauth_id,
+    )
+
+
+def test_create_user_upsert_returns_existing_row(db_manager):
+    created = db_manager.create_user(_user())
+    assert created is not None
+    assert created.last_login is None
+
+    again = db_manager.create_user(_user(email="other@example.com", name="Other"))
+    assert again.id == created.id
+    # Only last_login is touched on conflict; profile fields stay as stored
+    assert again.email == "ada@example.com"
+    assert again.name == "Ada"
+    assert again.last_login is not None
+
+    with db_manager.engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM users")).scalar() == 1
+
+
+def test_create_user_distinct_oauth_ids(db_manager):
+    first = db_manager.create_user(_user(oauth_id="1"))
+    second = db_manager.create_user(_user(oauth_id="2", email="bob@example.com"))
+    assert first.id != second.id
+
+
+def test_chat_ownership_after_delete_and_id_reuse(db_manager):
+    alice = db_manager.create_user(_user(oauth_id="1"))
+    bob = db_manager.create_user(_user(oauth_id="2", email="bob@example.com"))
+
+    chat = db_manager.create_chat_session(alice.id, "Alice's chat")
+    assert db_manager.chat_belongs_to_user(chat.id, alice.id)
+    assert not db_manager.chat_belongs_to_user(chat.id, bob.id)
+
+    assert db_manager.delete_chat_session(chat.id)
+    assert not db_manager.chat_belongs_to_user(chat.id, alice.id)
+
+    # SQLite hands the freed rowid to the next insert
+    reused = db_manager.create_chat_session(bob.id, "Bob's chat")
+    assert reused.id == chat.id
+    assert db_manager.chat_belongs_to_user(reused.id, bob.id)
+    assert not db_manager.chat_belongs_to_user(reused.id, alice.id)
+
+
+def test_message_insert_touches_chat(db_manager):
+    assert db_manager._touch_trigger_enabled
+    user = db_manager.create_user(_user())
+    chat = db_manager.create_chat_session(user.id, "Touched")
+
+    with db_manager.engine.begin() as connection:
+        connection.execute(
+            text("UPDATE chat_sessions SET updated_at = '2000-01-01 00:00:00.000000' WHERE id = :id"),
+            {"id": chat.id},
+        )
+
+    message = db_manager.add_message_to_chat(chat.id, "user", "hello")
+    assert message is not None
+
+    with db_manager.engine.connect() as connection:
+        updated_at = connection.execute(
+            text("SELECT updated_at FROM chat_sessions WHERE id = :id"), {"id": chat.id}
+        ).scalar()
+    assert not str(updated_at).startswith("2000-01-01")
+    assert str(updated_at) >= str(message.created_at)[:19].replace("T", " ")
+
+
+def test_search_chats_uses_fts(db_manager):
+    assert db_manager._fts_enabled
+    user = db_manager.create_user(_user())
+    other = db_manager.create_user(_user(oauth_id="2", email="bob@example.com"))
+
+    titled = db_manager.create_chat_session(user.id, "Quarterly budget review")
+    with_message = db_manager.create_chat_session(user.id, "Untitled")
+    db_manager.add_message_to_chat(with_message.id, "user", "Where is the budget spreadsheet?")
+    db_manager.create_chat_session(user.id, "Holiday plans")
+    foreign = db_manager.create_chat_session(other.id, "Budget for Bob")
+
+    results = db_manager.search_chats(user.id, "budget")
+    by_id = {result["id"]: result for result in results}
+
+    assert set(by_id) == {titled.id, with_message.id}
+    assert foreign.id not in by_id
+    assert by_id[titled.id]["match_type"] == "title"
+    assert by_id[with_message.id]["match_type"] == "message"
+    assert "budget spreadsheet" in by_id[with_message.id]["matched_content"]
+
+
+def test_search_chats_sees_updates_and_deletes(db_manager):
+    user = db_manager.create_user(_user())
+    chat = db_manager.create_chat_session(user.id, "Old title")
+
+    db_manager.update_chat_session(chat.id, title="Renamed roadmap")
+    assert [r["id"] for r in db_manager.search_chats(user.id, "roadmap")] == [chat.id]
+    assert db_manager.search_chats(user.id, "Old title") == []
+
+    db_manager.delete_chat_session(chat.id)
+    assert db_manager.search_chats(user.id, "roadmap") == []
+
+
+def test_user_stats_follow_committed_writes(db_manager):
+    user = db_manager.create_user(_user())
+    assert db_manager.get_user_statistics(user.id)["total_chats"] == 0
+
+    chat = db_manager.create_chat_session(user.id, "Counted")
+    db_manager.add_message_to_chat(chat.id, "user", "hello")
+    stats = db_manager.get_user_statistics(user.id)
+    assert (stats["total_chats"], stats["total_messages"]) == (1, 1)
+
+    db_manager.delete_chat_session(chat.id)
+    stats = db_manager.get_user_statistics(user.id)
+    assert (stats["total_chats"], stats["total_messages"]) == (0, 0)
+
+
+def test_user_stats_invalidated_only_after_commit(db_manager):
+    user = db_manager.create_user(_user())
+    db_manager.get_user_statistics(user.id)
+
+    with db_manager.session_scope():
+        db_manager.create_chat_session(user.id, "Pending")
+        # Still the committed counts until the scope commits
+        assert user.id in db_manager._user_stats_cache
+        assert db_manager.get_user_statistics(user.id)["total_chats"] == 0
+    assert user.id not in db_manager._user_stats_cache
+    assert db_manager.get_user_statistics(user.id)["total_chats"] == 1
+
+
+def test_user_stats_read_overlapping_a_commit_is_not_cached(db_manager):
+    user = db_manager.create_user(_user())
+    chat = db_manager.create_chat_session(user.id, "Racing")
+
+    # A write commits while the statistics query runs (after the read took
+    # its snapshot generation): its result must not be stored
+    original = db_manager.get_session
+
+    def get_session_with_concurrent_write():
+        del db_manager.get_session
+        db_manager.add_message_to_chat(chat.id, "user", "concurrent")
+        return original()
+
+    db_manager.get_session = get_session_with_concurrent_write
+    db_manager.get_user_statistics(user.id)
+    assert user.id not in db_manager._user_stats_cache
+    assert db_manager.get_user_statistics(user.id)["total_messages"] == 1
+
+
+def test_database_stats_flush_logs_on_every_call(db_manager):
+    db_manager.get_database_stats()
+    db_manager.log_chat("question", "answer")
+
+    # Served from the stats cache, but the buffered log is still written
+    stats = db_manager.get_database_stats()
+    assert db_manager._log_buffer == []
+    with db_manager.engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM chat_logs")).scalar() == 1
+    assert stats["chat_logs"] == 0
+
+
+def test_database_stats_failure_is_not_cached(db_manager):
+    def failing_session():
+        raise RuntimeError("database is locked")
+
+    db_manager.get_session = failing_session
+    assert db_manager.get_database_stats() == {}
+
+    del db_manager.get_session
+    assert db_manager.get_database_stats()["users"] == 0
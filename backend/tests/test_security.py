@@ -0,0 +1,52 @@
+import importlib
+import time
+from datetime import timedelta
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+
+
+def _claims():
+    return {"sub": "42", "name": "Ada", "email": "ada@example.com"}
+
+
+def test_token_round_trip():
+    token = security.create_access_token(_claims())
+    data = security.decode_access_token(token)
+    assert data is not None
+    assert data.sub == "42"
+    assert security.verify_token(token)["user_id"] == "42"
+
+
+def test_token_survives_process_state_reset():
+    token = security.create_access_token(_claims())
+    assert security.decode_access_token(token) is not None
+
+    # A restart or another worker starts with empty in-memory state; tokens
+    # carry no server-side version, so they stay valid until they expire
+    reloaded = importlib.reload(security)
+    assert "ver" not in jwt.decode(token, options={"verify_signature": False})
+    assert reloaded.decode_access_token(token) is not None
+    assert reloaded.verify_token(token)["user_id"] == "42"
+
+
+def test_expired_token_is_rejected():
+    token = security.create_access_token(_claims(), expires_delta=timedelta(seconds=1))
+    assert security.decode_access_token(token) is not None
+
+    time.sleep(1.1)
+    assert security.decode_access_token(token) is None
+    with pytest.raises(HTTPException) as excinfo:
+        security.verify_token(token)
+    assert excinfo.value.status_code == 401
+
+
+def test_tampered_token_is_rejected():
+    token = security.create_access_token(_claims())
+    forged = jwt.encode(
+        jwt.decode(token, options={"verify_signature": False}), "wrong-key", algorithm="HS256"
+    )
+    assert security.decode_access_token(forged) is None